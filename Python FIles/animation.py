@@ -0,0 +1,116 @@
+import threading
+import time
+
+# ─── Non-Blocking Animation Scheduler ─────────────────────────────
+# Animations run on one frame-timer thread instead of sleeping on the caller's
+# thread.  Progress is computed from wall-clock time, so when a frame is late
+# the animation simply jumps ahead (frames are skipped, never queued) and data
+# updates are not held up behind it.  Starting a new animation for a key that
+# is still animating replaces it, continuing from the current position.
+
+TARGET_FPS = 30
+
+
+def linear(t):
+    return t
+
+
+def ease_in_out(t):
+    return t * t * (3 - 2 * t)
+
+
+def ease_out(t):
+    return 1 - (1 - t) ** 3
+
+
+class Animator:
+    def __init__(self, fps=TARGET_FPS):
+        self.frame_interval = 1.0 / fps
+        self.frames = 0
+        self.frames_skipped = 0
+        self._animations = {}  # key -> animation dict
+        self._positions = {}  # key -> last location set by slide()
+        self._wakeup = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def animate(
+        self, key, duration, update, delay=0.0, easing=ease_in_out, on_done=None
+    ):
+        """Call `update(progress)` every frame for `duration` seconds.
+
+        `progress` runs from 0 to 1 after `easing`.  Any running animation
+        with the same key is cancelled (its on_done is not called).
+        """
+        with self._wakeup:
+            self._animations[key] = {
+                "begin": time.monotonic() + delay,
+                "duration": max(duration, 1e-6),
+                "update": update,
+                "easing": easing,
+                "on_done": on_done,
+            }
+            self._wakeup.notify()
+
+    def slide(
+        self,
+        key,
+        model,
+        to,
+        start=None,
+        duration=2.0,
+        delay=0.0,
+        easing=ease_in_out,
+        on_done=None,
+    ):
+        """Move `model` to location `to`, from `start` or where it currently is."""
+        state = {}
+
+        def update(progress):
+            if "from" not in state:
+                state["from"] = start or self._positions.get(key, to)
+            location = tuple(a + (b - a) * progress for a, b in zip(state["from"], to))
+            model.set_model_location(*location)
+            self._positions[key] = location
+
+        self.animate(key, duration, update, delay, easing, on_done)
+
+    def cancel(self, key):
+        with self._wakeup:
+            self._animations.pop(key, None)
+
+    def is_animating(self, key):
+        with self._wakeup:
+            return key in self._animations
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while not self._animations:
+                    self._wakeup.wait()
+                active = list(self._animations.items())
+            frame_start = time.monotonic()
+            for key, animation in active:
+                if frame_start < animation["begin"]:
+                    continue
+                progress = min(
+                    1.0, (frame_start - animation["begin"]) / animation["duration"]
+                )
+                try:
+                    animation["update"](animation["easing"](progress))
+                except Exception as e:
+                    print(f"Animation {key} failed: {e}")
+                    progress = 1.0
+                if progress >= 1.0:
+                    with self._wakeup:
+                        # Only finish it if it was not replaced meanwhile
+                        if self._animations.get(key) is not animation:
+                            continue
+                        del self._animations[key]
+                    if animation["on_done"]:
+                        animation["on_done"]()
+            self.frames += 1
+            elapsed = time.monotonic() - frame_start
+            if elapsed > self.frame_interval:
+                self.frames_skipped += int(elapsed / self.frame_interval)
+            time.sleep(max(0.0, self.frame_interval - elapsed))
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from response_decoder import UNIXTIME_PARAMS, decode_columns
+from weather_client import ARCHIVE_URL, get_json
+from locations import current_location
+from weather_store import WeatherStore, location_key
+
+# ─── Historical Backfill from the Open-Meteo Archive API ──────────
+# Fetches multi-year hourly history into the local weather store (run from
+# the project root):
+#     python "Python FIles/backfill.py" --start 2020-01-01 --end 2024-12-31
+# The range is split into chunks the archive API accepts, fetched by a bounded
+# worker pool.  Every stored chunk is checkpointed, so an interrupted run picks
+# up where it stopped.  --url (or OPEN_METEO_BASE_URL) points it at another
+# server, e.g. the fixture server replaying recorded archive responses.
+
+# The same hourly variables the real-time dashboard requests
+HOURLY_VARIABLES = [
+    "temperature_2m",
+    "precipitation",
+    "rain",
+    "showers",
+    "snowfall",
+    "weather_code",
+    "cloud_cover",
+    "wind_speed_10m",
+    "wind_direction_10m",
+    "relative_humidity_2m",
+    "pressure_msl",
+    "soil_temperature_0_to_7cm",
+    "soil_temperature_7_to_28cm",
+    "soil_temperature_28_to_100cm",
+    "soil_temperature_100_to_255cm",
+    "soil_moisture_0_to_7cm",
+    "soil_moisture_7_to_28cm",
+    "soil_moisture_28_to_100cm",
+    "soil_moisture_100_to_255cm",
+    "cloud_cover_low",
+    "cloud_cover_mid",
+    "cloud_cover_high",
+]
+CHUNK_DAYS = 90
+WORKERS = 4
+# The archive lags real time by a few days
+ARCHIVE_DELAY_DAYS = 5
+CHECKPOINT_DIR = ".cache"
+
+
+def date_chunks(start, end, chunk_days=CHUNK_DAYS):
+    """Split the inclusive range [start, end] into (start, end) date pairs."""
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, start + timedelta(days=chunk_days - 1))
+        chunks.append((start, chunk_end))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def chunk_id(start, end):
+    return f"{start.isoformat()}/{end.isoformat()}"
+
+
+def checkpoint_path(location, checkpoint_dir=CHECKPOINT_DIR):
+    return os.path.join(checkpoint_dir, f"backfill_{location.replace(',', '_')}.json")
+
+
+def load_checkpoint(path):
+    try:
+        with open(path) as f:
+            return set(json.load(f)["done"])
+    except (OSError, ValueError, KeyError):
+        return set()
+
+
+def save_checkpoint(path, done):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"done": sorted(done)}, f)
+    os.replace(tmp_path, path)
+
+
+def fetch_chunk(url, latitude, longitude, start, end, variables=HOURLY_VARIABLES):
+    payload = get_json(
+        url,
+        {
+            "latitude": latitude,
+            "longitude": longitude,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "hourly": ",".join(variables),
+            "timezone": "auto",
+            **UNIXTIME_PARAMS,
+        },
+        # Every chunk is requested once; keeping it for serving stale would
+        # only hold the whole archive in memory
+        keep_stale=False,
+    )
+    return decode_columns(payload.get("hourly", {}))
+
+
+def backfill(
+    start,
+    end,
+    latitude=None,
+    longitude=None,
+    url=ARCHIVE_URL,
+    store=None,
+    chunk_days=CHUNK_DAYS,
+    workers=WORKERS,
+    checkpoint_dir=CHECKPOINT_DIR,
+):
+    """Fetch [start, end] into `store`; returns the number of chunks fetched.
+
+    Without coordinates the current site (WEATHER_LOCATION) is backfilled.
+    Chunks already recorded in the checkpoint are skipped.  A failed chunk is
+    reported and left for the next run; the others still complete.
+    """
+    if latitude is None or longitude is None:
+        site = current_location()
+        latitude, longitude = site.latitude, site.longitude
+    store = store or WeatherStore()
+    location = location_key(latitude, longitude)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = checkpoint_path(location, checkpoint_dir)
+    done = load_checkpoint(path)
+    pending = [
+        chunk
+        for chunk in date_chunks(start, end, chunk_days)
+        if chunk_id(*chunk) not in done
+    ]
+    print(f"Backfill {location}: {len(pending)} chunks to fetch, {len(done)} done")
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(fetch_chunk, url, latitude, longitude, *chunk): chunk
+            for chunk in pending
+        }
+        # Results are written and checkpointed on this thread as they arrive
+        for future in as_completed(futures):
+            chunk_start, chunk_end = futures[future]
+            try:
+                columns = future.result()
+            except Exception as e:
+                print(f"Chunk {chunk_start} to {chunk_end} failed: {e}")
+                continue
+            rows = store.write(location, columns)
+            done.add(chunk_id(chunk_start, chunk_end))
+            save_checkpoint(path, done)
+            fetched += 1
+            print(f"Stored {chunk_start} to {chunk_end} ({rows} values)")
+    return fetched
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Backfill hourly history from the Open-Meteo archive API"
+    )
+    parser.add_argument("--start", type=date.fromisoformat, required=True)
+    parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        default=date.today() - timedelta(days=ARCHIVE_DELAY_DAYS),
+    )
+    parser.add_argument(
+        "--latitude", type=float, help="default: the WEATHER_LOCATION site"
+    )
+    parser.add_argument("--longitude", type=float)
+    parser.add_argument("--url", default=ARCHIVE_URL)
+    parser.add_argument("--chunk-days", type=int, default=CHUNK_DAYS)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args()
+    backfill(
+        args.start,
+        args.end,
+        latitude=args.latitude,
+        longitude=args.longitude,
+        url=args.url,
+        chunk_days=args.chunk_days,
+        workers=args.workers,
+    )
@@ -0,0 +1,38 @@
+import glob
+import os
+import sys
+
+from mesh_cache import bundle_path, parse_obj, write_bundle
+
+# ─── Precompile OBJ Models into Binary Mesh Bundles ───────────────
+# Run once after checking out or changing models (from the project root):
+#     python "Python FIles/build_mesh_assets.py"
+# The dashboards memory-map the resulting ".meshbin" files instead of parsing
+# the OBJ text on every start; a missing or outdated bundle falls back to OBJ.
+ASSET_DIRS = ["Dataset", "Weekly dash"]
+
+
+def build_bundles(asset_dirs=ASSET_DIRS, force=False):
+    built = []
+    for asset_dir in asset_dirs:
+        for obj_path in sorted(glob.glob(os.path.join(asset_dir, "*.obj"))):
+            out_path = bundle_path(obj_path)
+            if (
+                not force
+                and os.path.exists(out_path)
+                and os.path.getmtime(out_path) >= os.path.getmtime(obj_path)
+            ):
+                continue
+            mesh = parse_obj(obj_path)
+            write_bundle(mesh, out_path)
+            print(
+                f"{obj_path} -> {out_path} "
+                f"({os.path.getsize(obj_path)} -> {os.path.getsize(out_path)} bytes)"
+            )
+            built.append(out_path)
+    return built
+
+
+if __name__ == "__main__":
+    dirs = [a for a in sys.argv[1:] if a != "--force"] or ASSET_DIRS
+    build_bundles(dirs, force="--force" in sys.argv)
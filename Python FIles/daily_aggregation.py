@@ -0,0 +1,101 @@
+import numpy as np
+
+import metrics
+from response_decoder import MISSING_CODE
+
+# ─── Vectorized Daily Aggregation ─────────────────────────────────
+# Groups hourly Open-Meteo columns by calendar day in a single pass over NumPy
+# arrays: the day of every row is computed once, then each statistic is a
+# bincount / reduceat over that grouping.  Scales to multi-year hourly input.
+
+STATISTICS = ("mean", "min", "max", "sum", "mode", "circular_mean")
+# Weather codes are WMO codes 0-99
+MODE_CATEGORIES = 100
+
+
+def day_keys(times, utc_offset_seconds=0):
+    """Calendar day ("YYYY-MM-DD") of each timestamp.
+
+    Accepts ISO strings as returned by Open-Meteo ("2025-02-25T13:00") or unix
+    epoch seconds, which are shifted by `utc_offset_seconds` to local time.
+    """
+    times = np.asarray(times)
+    if times.dtype.kind in "iuf":
+        local = times.astype(np.int64) + int(utc_offset_seconds)
+        return (local // 86400).astype("datetime64[D]").astype("U10")
+    # Truncating the ISO string to 10 characters leaves the date part
+    return times.astype("U10")
+
+
+def _grouped_sum(group, values, n_groups):
+    valid = ~np.isnan(values)
+    sums = np.bincount(group[valid], weights=values[valid], minlength=n_groups)
+    counts = np.bincount(group[valid], minlength=n_groups)
+    return sums, counts
+
+
+def _grouped_extreme(group, values, order, starts, reduce, fill):
+    """Per-group min/max via reduceat over the rows sorted by group."""
+    valid = ~np.isnan(values)
+    out = reduce.reduceat(np.where(valid, values, fill)[order], starts)
+    out[np.bincount(group[valid], minlength=len(starts)) == 0] = np.nan
+    return out
+
+
+@metrics.timed("aggregate")
+def aggregate_daily(times, columns, statistics, utc_offset_seconds=0):
+    """Aggregate hourly `columns` per calendar day.
+
+    Args:
+        times: hourly timestamps (ISO strings or unix seconds)
+        columns: {variable: hourly values}
+        statistics: {variable: iterable of names from STATISTICS}
+
+    Returns:
+        (days, result) where `days` is a sorted array of "YYYY-MM-DD" strings
+        and `result[variable][statistic]` is an array aligned with `days`.
+    """
+    days, group = np.unique(day_keys(times, utc_offset_seconds), return_inverse=True)
+    n_days = len(days)
+    # Row order grouped by day, and where each day's rows start in it
+    order = np.argsort(group, kind="stable")
+    starts = np.searchsorted(group[order], np.arange(n_days))
+    result = {}
+    for variable, wanted in statistics.items():
+        values = np.asarray(columns[variable], dtype=float)
+        stats = result[variable] = {}
+        if "mean" in wanted or "sum" in wanted:
+            sums, counts = _grouped_sum(group, values, n_days)
+            if "sum" in wanted:
+                stats["sum"] = sums
+            if "mean" in wanted:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    stats["mean"] = sums / counts
+        if "min" in wanted:
+            stats["min"] = _grouped_extreme(
+                group, values, order, starts, np.minimum, np.inf
+            )
+        if "max" in wanted:
+            stats["max"] = _grouped_extreme(
+                group, values, order, starts, np.maximum, -np.inf
+            )
+        if "mode" in wanted:
+            # Decoded codes mark missing values as 255, outside the WMO range
+            valid = (values >= 0) & (values < MODE_CATEGORIES)
+            codes = values[valid].astype(np.int64)
+            counts = np.bincount(
+                group[valid] * MODE_CATEGORIES + codes,
+                minlength=n_days * MODE_CATEGORIES,
+            ).reshape(n_days, MODE_CATEGORIES)
+            # Ties resolve to the smallest code.  This deliberately replaces
+            # max(set(codes), key=codes.count), which broke ties in set
+            # iteration order; days without a valid code get MISSING_CODE
+            stats["mode"] = np.where(
+                counts.sum(axis=1) > 0, counts.argmax(axis=1), MISSING_CODE
+            )
+        if "circular_mean" in wanted:
+            radians = np.deg2rad(values)
+            sin_sum, _ = _grouped_sum(group, np.sin(radians), n_days)
+            cos_sum, _ = _grouped_sum(group, np.cos(radians), n_days)
+            stats["circular_mean"] = np.rad2deg(np.arctan2(sin_sum, cos_sum)) % 360
+    return days, result
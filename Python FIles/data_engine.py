@@ -0,0 +1,83 @@
+import asyncio
+import collections
+import threading
+
+from response_cache import cached_get_json
+
+# ─── Asyncio Data Engine ──────────────────────────────────────────
+# Independent Open-Meteo requests (past, forecast, current, ...) are issued
+# concurrently on an event loop running in its own thread, parsed, and
+# published to subscribers.  Dashboards that are still synchronous use the
+# blocking façade (fetch_sync / fetch_all_sync).
+#
+# The transport is the pooled, cached client: each request runs on a worker
+# thread via asyncio.to_thread, so concurrency is bounded by the connection
+# pool rather than by an extra async HTTP dependency.
+
+Endpoint = collections.namedtuple("Endpoint", ["url", "params", "parse", "fetch"])
+
+
+class DataEngine:
+    def __init__(self, fetch=cached_get_json):
+        self.fetch_json = fetch
+        self.endpoints = {}
+        self.frames = {}
+        self._subscribers = collections.defaultdict(list)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def register(self, name, url, params, parse=lambda data: data, fetch=None):
+        """Register an endpoint; `parse` turns the JSON payload into a frame.
+
+        `fetch(url, params)` overrides the engine's transport for this endpoint.
+        """
+        self.endpoints[name] = Endpoint(
+            url, dict(params), parse, fetch or self.fetch_json
+        )
+        return self
+
+    def subscribe(self, name, callback):
+        """Call `callback(frame)` (on the engine thread) whenever `name` updates."""
+        self._subscribers[name].append(callback)
+        return self
+
+    def latest(self, name):
+        return self.frames.get(name)
+
+    # ----- Async API -----
+    async def fetch(self, name):
+        endpoint = self.endpoints[name]
+        data = await asyncio.to_thread(endpoint.fetch, endpoint.url, endpoint.params)
+        frame = await asyncio.to_thread(endpoint.parse, data)
+        self._publish(name, frame)
+        return frame
+
+    async def fetch_all(self, names=None):
+        """Fetch endpoints concurrently; failed ones map to their exception."""
+        names = list(names or self.endpoints)
+        results = await asyncio.gather(
+            *(self.fetch(name) for name in names), return_exceptions=True
+        )
+        return dict(zip(names, results))
+
+    def _publish(self, name, frame):
+        self.frames[name] = frame
+        for callback in self._subscribers[name]:
+            try:
+                callback(frame)
+            except Exception as e:
+                print(f"Subscriber for {name} failed: {e}")
+
+    # ----- Synchronous façade -----
+    def run(self, coroutine, timeout=None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def fetch_sync(self, name, timeout=None):
+        return self.run(self.fetch(name), timeout)
+
+    def fetch_all_sync(self, names=None, timeout=None):
+        return self.run(self.fetch_all(names), timeout)
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,184 @@
+import threading
+
+import numpy as np
+
+# ─── Downsampling for Long-Range Trend Views ──────────────────────
+# A line chart cannot show more than a couple of points per horizontal pixel,
+# so long ranges are reduced before they are sent: "lttb" (Largest Triangle
+# Three Buckets) keeps the visual shape, "minmax" keeps every bucket's extremes
+# (spikes survive).  ZoomResampler re-sends the visible range at full
+# resolution, or as close to it as the chart width allows, when the user zooms;
+# interval moves made by a WindowFitter following new data are ignored.  The
+# chart only retains recent points, so a `source` (e.g. the local WeatherStore)
+# supplies the part of a zoomed or panned range older than those.
+
+MODES = ("lttb", "minmax")
+POINTS_PER_PIXEL = 2
+DEFAULT_WIDTH_PX = 1200
+
+
+def target_points(width_px, points_per_pixel=POINTS_PER_PIXEL):
+    return max(4, int(width_px * points_per_pixel))
+
+
+def chart_width(chart, default=DEFAULT_WIDTH_PX):
+    """Chart width in pixels (needs a live chart), or `default`."""
+    try:
+        size = chart.get_size_pixels()
+    except Exception:
+        return default
+    if isinstance(size, dict):
+        size = size.get("x", size.get("width"))
+    return int(size) if size else default
+
+
+def minmax(x, y, n_out):
+    """Keep the min and max of each of n_out // 2 equal-count buckets."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n_buckets = n_out // 2
+    if len(x) <= n_out or n_buckets < 1:
+        return x, y
+    starts = np.linspace(0, len(x), n_buckets + 1).astype(int)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(starts))
+    missing = np.isnan(y)
+    # Sorting by (bucket, value) puts each bucket's min first and max last;
+    # missing values sort to the far end so they are only kept if all missing
+    by_low = np.lexsort((np.where(missing, np.inf, y), bucket))
+    by_high = np.lexsort((np.where(missing, -np.inf, y), bucket))
+    keep = np.unique(
+        np.concatenate([by_low[starts[:-1]], by_high[starts[1:] - 1], [0, len(x) - 1]])
+    )
+    return x[keep], y[keep]
+
+
+def lttb(x, y, n_out):
+    """Largest Triangle Three Buckets; keeps the first and last point."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return x, y
+    # Interior points split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third vertex
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        # Missing values have no area; pick the bucket's first point then
+        areas = np.nan_to_num(areas, nan=-1.0)
+        previous = start + int(np.argmax(areas))
+        keep[i + 1] = previous
+    return x[keep], y[keep]
+
+
+def downsample(x, y, n_out, mode="minmax"):
+    if mode == "lttb":
+        return lttb(x, y, n_out)
+    if mode == "minmax":
+        return minmax(x, y, n_out)
+    raise ValueError(f"Unknown downsampling mode {mode!r}, expected one of {MODES}")
+
+
+class ZoomResampler:
+    def __init__(
+        self,
+        x_axis,
+        retained,
+        width_px=DEFAULT_WIDTH_PX,
+        mode="minmax",
+        fitter=None,
+        lock=None,
+        source=None,
+    ):
+        """`retained` is {name: RetainedSeries}, the recent full-resolution points.
+
+        `source(start, end)` returns {name: (x, y)} at full resolution for
+        start <= x < end, for ranges before the retained points; without it
+        only those points can be shown.  `fitter` is the WindowFitter moving
+        `x_axis`, whose own interval changes are not zooms.  `lock` must be
+        held by whoever else adds to the series; resampling runs on the
+        chart's event thread under it.
+        """
+        self.x_axis = x_axis
+        self.retained = retained
+        self.mode = mode
+        self.source = source
+        self.fitter = fitter
+        self.lock = lock or threading.Lock()
+        self.resamples = 0
+        self._zoomed = False
+        self.set_width(width_px)
+
+    def set_width(self, width_px):
+        self.points = target_points(width_px)
+        for series in self.retained.values():
+            series.display_points = self.points
+            series.display_mode = self.mode
+
+    def attach(self, throttle_ms=250):
+        self.x_axis.add_event_listener(
+            "intervalchange", handler=self._on_interval_change, throttle_ms=throttle_ms
+        )
+        return self
+
+    def _on_interval_change(self, event):
+        start, end = float(event["start"]), float(event["end"])
+        try:
+            with self.lock:
+                if self.fitter is not None and self.fitter.is_fitted(start, end):
+                    # The fitter following new data; only leaving a zoom
+                    # needs the whole window re-sent
+                    if not self._zoomed:
+                        return
+                    self._zoomed = False
+                else:
+                    self._zoomed = True
+                self.show(start, end)
+        except Exception as e:
+            print(f"Trend resampling failed: {e}")
+
+    def _history(self, start, end):
+        """{name: (x, y)} from `source` for the range before each series' points."""
+        if self.source is None:
+            return {}
+        firsts = {}
+        for name, series in self.retained.items():
+            x, _ = series.points()
+            firsts[name] = x[0] if len(x) else np.inf
+        until = min(end, max(firsts.values()))
+        if start >= until:
+            return {}
+        history = {}
+        for name, (x, y) in self.source(start, until).items():
+            x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+            keep = (x < firsts[name]) & ~np.isnan(y)
+            history[name] = x[keep], y[keep]
+        return history
+
+    def show(self, start, end):
+        """Re-send every series for [start, end] at up to `points` points."""
+        history = self._history(start, end)
+        windows = {}
+        for name, series in self.retained.items():
+            x, y = series.points(start, end)
+            if name in history:
+                x = np.concatenate([history[name][0], x])
+                y = np.concatenate([history[name][1], y])
+            windows[name] = x, y
+        dense = any(len(x) > self.points for x, _ in windows.values())
+        # Nothing to gain unless this range is reduced or the chart does not
+        # hold every retained point at full resolution
+        if not dense and all(series.complete for series in self.retained.values()):
+            return False
+        for name, (x, y) in windows.items():
+            self.retained[name].redraw(x, y)
+        self.resamples += 1
+        return True
@@ -0,0 +1,108 @@
+from locations import fetch_batched
+from response_cache import cached_get_json
+
+# ─── Request Coalescing Planner ───────────────────────────────────
+# Several widgets need different slices of the same forecast endpoint.  Each
+# one registers the variables it needs, the planner merges them into as few
+# requests as possible (one per location/timezone, and locations that need the
+# same variables share one multi-coordinate request) and hands every consumer
+# a payload shaped like its own Open-Meteo response.
+
+GROUPS = ("current", "hourly", "daily")
+
+
+class FetchPlanner:
+    def __init__(self, url, fetch=cached_get_json, base_params=None):
+        self.url = url
+        # Extra parameters sent with every merged request (e.g. timeformat)
+        self.base_params = dict(base_params or {})
+        self.fetch_json = fetch
+        self.consumers = {}
+
+    def register(
+        self,
+        name,
+        latitude,
+        longitude,
+        current=(),
+        hourly=(),
+        daily=(),
+        past_days=0,
+        forecast_days=0,
+        timezone="auto",
+    ):
+        self.consumers[name] = {
+            "location": (latitude, longitude, timezone),
+            "current": tuple(current),
+            "hourly": tuple(hourly),
+            "daily": tuple(daily),
+            "past_days": past_days,
+            "forecast_days": forecast_days,
+        }
+        return self
+
+    def plan(self):
+        """Merged request parameters, one dict per location."""
+        merged = {}
+        for consumer in self.consumers.values():
+            latitude, longitude, timezone = consumer["location"]
+            params = merged.setdefault(
+                consumer["location"],
+                {
+                    **self.base_params,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "timezone": timezone,
+                    "past_days": 0,
+                    "forecast_days": 0,
+                },
+            )
+            for group in GROUPS:
+                if consumer[group]:
+                    variables = set(params.get(group, "").split(",")) - {""}
+                    variables.update(consumer[group])
+                    params[group] = ",".join(sorted(variables))
+            if consumer["hourly"] or consumer["daily"]:
+                params["past_days"] = max(params["past_days"], consumer["past_days"])
+                params["forecast_days"] = max(
+                    params["forecast_days"], consumer["forecast_days"]
+                )
+        return merged
+
+    def fetch(self):
+        """Run the merged requests and return {consumer name: payload}."""
+        plan = self.plan()
+        responses = dict(
+            zip(plan, fetch_batched(self.url, list(plan.values()), self.fetch_json))
+        )
+        return {
+            name: _slice_payload(
+                responses[consumer["location"]],
+                consumer,
+                plan[consumer["location"]]["past_days"],
+            )
+            for name, consumer in self.consumers.items()
+        }
+
+
+def _slice_payload(payload, consumer, merged_past_days):
+    """Cut a merged response down to one consumer's variables and days."""
+    result = {k: v for k, v in payload.items() if k not in GROUPS}
+    for group in GROUPS:
+        variables = consumer[group]
+        if not variables or group not in payload:
+            continue
+        block = payload[group]
+        if group == "current":
+            keep = ("time", "interval") + variables
+            result[group] = {k: block[k] for k in keep if k in block}
+            continue
+        # Hourly/daily blocks start `past_days` days before today, so the
+        # consumer's own window is a fixed offset into the merged block.
+        per_day = 24 if group == "hourly" else 1
+        start = (merged_past_days - consumer["past_days"]) * per_day
+        end = start + (consumer["past_days"] + consumer["forecast_days"]) * per_day
+        result[group] = {
+            k: block[k][start:end] for k in ("time",) + variables if k in block
+        }
+    return result
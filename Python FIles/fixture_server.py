@@ -0,0 +1,151 @@
+import argparse
+import glob
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+from weather_client import request_key
+
+# ─── Offline Open-Meteo Fixture Server ────────────────────────────
+# Replays responses recorded with WEATHER_RECORD_DIR (run from the project root):
+#     WEATHER_RECORD_DIR=fixtures python "Python FIles/real_time_bars.py"
+#     python "Python FIles/fixture_server.py" fixtures --port 8787 --shift-time
+#     OPEN_METEO_BASE_URL=http://127.0.0.1:8787 python "Python FIles/real_time_bars.py"
+# Requests are matched on path and parameters; a request whose date range
+# differs (start_date, past_days, ...) falls back to the latest recording with
+# otherwise equal parameters.  --shift-time moves recorded unix timestamps
+# forward by whole days so old recordings look current.  --latency and
+# --failure-rate inject delay and 503 responses.
+
+DATE_PARAMS = ("start_date", "end_date", "past_days", "forecast_days")
+DAY = 86400
+
+
+def _loose_key(path, params):
+    return request_key(path, {k: v for k, v in params.items() if k not in DATE_PARAMS})
+
+
+def load_fixtures(directory):
+    """({exact key: fixture}, {key without date params: latest fixture})."""
+    exact, loose = {}, {}
+    for fixture_path in glob.glob(os.path.join(directory, "*.json")):
+        with open(fixture_path) as f:
+            fixture = json.load(f)
+        exact[request_key(fixture["path"], fixture["params"])] = fixture
+        key = _loose_key(fixture["path"], fixture["params"])
+        if fixture["recorded_at"] >= loose.get(key, {}).get("recorded_at", 0):
+            loose[key] = fixture
+    return exact, loose
+
+
+def _shift_times(value, offset):
+    if isinstance(value, list):
+        return [_shift_times(item, offset) for item in value]
+    if not isinstance(value, dict):
+        return value
+    shifted = {}
+    for key, item in value.items():
+        if key == "time" and isinstance(item, int):
+            shifted[key] = item + offset
+        elif key == "time" and isinstance(item, list):
+            shifted[key] = [t + offset if isinstance(t, int) else t for t in item]
+        else:
+            shifted[key] = _shift_times(item, offset)
+    return shifted
+
+
+def day_offset(recorded_at, now=None):
+    """Seconds that move `recorded_at` onto today's date (whole days)."""
+    now = time.time() if now is None else now
+    return int((now // DAY - recorded_at // DAY) * DAY)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, directory, port=0, latency=0.0, failure_rate=0.0, shift_time=False
+    ):
+        self.exact, self.loose = load_fixtures(directory)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.shift_time = shift_time
+        self.served = 0
+        self.failed = 0
+        self.missing = 0
+        super().__init__(("127.0.0.1", port), _FixtureHandler)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def lookup(self, path, params):
+        fixture = self.exact.get(request_key(path, params))
+        return fixture or self.loose.get(_loose_key(path, params))
+
+    def start(self):
+        """Serve on a background thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query))
+        if server.latency:
+            time.sleep(server.latency)
+        if random.random() < server.failure_rate:
+            server.failed += 1
+            self._send(503, {"error": True, "reason": "injected failure"})
+            return
+        fixture = server.lookup(url.path, params)
+        if fixture is None:
+            server.missing += 1
+            self._send(404, {"error": True, "reason": "no fixture for request"})
+            return
+        body = fixture["body"]
+        if server.shift_time:
+            body = _shift_times(body, day_offset(fixture["recorded_at"]))
+        server.served += 1
+        self._send(200, body)
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded Open-Meteo responses")
+    parser.add_argument("directory", help="fixture directory (WEATHER_RECORD_DIR)")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--shift-time", action="store_true")
+    args = parser.parse_args()
+    server = FixtureServer(
+        args.directory,
+        port=args.port,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        shift_time=args.shift_time,
+    )
+    print(
+        f"Serving {len(server.exact)} fixtures on {server.base_url} "
+        f"(set OPEN_METEO_BASE_URL={server.base_url})"
+    )
+    server.serve_forever()
@@ -0,0 +1,107 @@
+import os
+import tracemalloc
+from importlib import metadata
+
+import numpy as np
+
+import metrics
+
+# ─── Geometry Hand-off to LightningChart ──────────────────────────
+# Meshes stay in contiguous float32/uint32 buffers (see mesh_cache) from load
+# until they are handed to set_model_geometry.  lightningchart 2.2 converts
+# NumPy arrays itself (set_model_geometry -> utils.convert_to_list ->
+# ndarray.tolist()), so with it the only Python-object copy is the one made at
+# the serialization boundary and no per-model lists are kept alive afterwards.
+# Other versions have not been checked and get plain lists from the shim below.
+ARRAY_HANDOFF_VERSIONS = ("2.2",)
+
+
+def _array_handoff_supported():
+    try:
+        version = metadata.version("lightningchart")
+    except metadata.PackageNotFoundError:
+        return False
+    return any(
+        version == checked or version.startswith(checked + ".")
+        for checked in ARRAY_HANDOFF_VERSIONS
+    )
+
+
+# True only for lightningchart versions checked to accept ndarrays
+ARRAY_HANDOFF = _array_handoff_supported()
+
+# Set WEATHER_PROFILE_UPLOADS=1 (or call profile_uploads()) to trace bytes and
+# allocations of every upload; this uses tracemalloc and slows uploads down.
+PROFILE_UPLOADS = os.environ.get("WEATHER_PROFILE_UPLOADS") == "1"
+
+upload_stats = {"uploads": 0, "bytes": 0}
+upload_profiles = []
+
+
+def profile_uploads(enabled=True):
+    global PROFILE_UPLOADS
+    PROFILE_UPLOADS = enabled
+
+
+def geometry_nbytes(mesh):
+    return mesh.vertices.nbytes + mesh.indices.nbytes + mesh.normals.nbytes
+
+
+def geometry_args(mesh, as_lists=None):
+    """Keyword arguments for set_model_geometry built from MeshArrays."""
+    if as_lists is None:
+        as_lists = not ARRAY_HANDOFF
+    vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+    indices = np.ascontiguousarray(mesh.indices, dtype=np.uint32)
+    normals = np.ascontiguousarray(mesh.normals, dtype=np.float32)
+    if as_lists:
+        return {
+            "vertices": vertices.tolist(),
+            "indices": indices.tolist(),
+            "normals": normals.tolist(),
+        }
+    return {"vertices": vertices, "indices": indices, "normals": normals}
+
+
+def upload_geometry(model, mesh, label=None):
+    """Send MeshArrays to a mesh model and record the upload size."""
+    nbytes = geometry_nbytes(mesh)
+    with metrics.timer("geometry_upload"):
+        if PROFILE_UPLOADS:
+            _profiled_upload(model, mesh, nbytes, label)
+        else:
+            model.set_model_geometry(**geometry_args(mesh))
+    upload_stats["uploads"] += 1
+    upload_stats["bytes"] += nbytes
+    metrics.count("geometry_upload_bytes_total", nbytes)
+    return model
+
+
+def _profiled_upload(model, mesh, nbytes, label):
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    base_memory, _ = tracemalloc.get_traced_memory()
+    model.set_model_geometry(**geometry_args(mesh))
+    _, peak_memory = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    allocations = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "lineno")
+        if stat.count_diff > 0
+    )
+    if started:
+        tracemalloc.stop()
+    profile = {
+        "label": label,
+        "buffer_bytes": nbytes,
+        "peak_python_bytes": peak_memory - base_memory,
+        "retained_allocations": allocations,
+    }
+    upload_profiles.append(profile)
+    print(
+        f"Geometry upload {label or ''}: {nbytes} buffer bytes, "
+        f"{profile['peak_python_bytes']} peak Python bytes, {allocations} retained allocations"
+    )
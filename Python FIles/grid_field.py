@@ -0,0 +1,89 @@
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from locations import MAX_BATCH, fetch_batched
+from response_decoder import UNIXTIME_PARAMS, decode_columns
+from weather_client import get_json
+
+# ─── Gridded Weather Fields ───────────────────────────────────────
+# A bounding box is sampled on a regular lat/lon grid and fetched with batched
+# multi-coordinate requests (MAX_BATCH points per call, several calls in
+# flight), then assembled into one (hour, row, column) array per variable.
+# heatmap_frames() converts every hour once to the nested lists the heatmap
+# series takes as is, so an animation only swaps precomputed frames.  Grids are
+# fetched fresh rather than through the persistent response cache: a forecast
+# grid is only meaningful for the run it came from.
+
+WORKERS = 4
+
+GridField = collections.namedtuple(
+    "GridField", ["times", "latitudes", "longitudes", "fields"]
+)
+
+
+def grid_points(south, west, north, east, step):
+    """Latitudes (rows) and longitudes (columns) covering the box every `step`°."""
+    latitudes = np.round(np.arange(south, north + step / 2, step), 4)
+    longitudes = np.round(np.arange(west, east + step / 2, step), 4)
+    return latitudes, longitudes
+
+
+def fetch_grid(
+    url,
+    latitudes,
+    longitudes,
+    variables,
+    forecast_days=1,
+    fetch=get_json,
+    batch_size=MAX_BATCH,
+    workers=WORKERS,
+):
+    """Fetch hourly `variables` for every grid point into a GridField."""
+    lat_grid, lon_grid = np.meshgrid(latitudes, longitudes, indexing="ij")
+    params_list = [
+        {
+            "latitude": float(lat),
+            "longitude": float(lon),
+            "hourly": ",".join(variables),
+            "forecast_days": forecast_days,
+            "timezone": "GMT",
+            **UNIXTIME_PARAMS,
+        }
+        for lat, lon in zip(lat_grid.ravel(), lon_grid.ravel())
+    ]
+    chunks = [
+        params_list[first : first + batch_size]
+        for first in range(0, len(params_list), batch_size)
+    ]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        payloads = [
+            payload
+            for chunk_payloads in pool.map(
+                lambda chunk: fetch_batched(url, chunk, fetch, batch_size), chunks
+            )
+            for payload in chunk_payloads
+        ]
+
+    columns = [decode_columns(payload.get("hourly", {})) for payload in payloads]
+    times = columns[0]["time"]
+    shape = (len(latitudes), len(longitudes), len(times))
+    fields = {
+        # (points, hours) -> (hours, rows, columns)
+        variable: np.stack([point[variable] for point in columns])
+        .astype(np.float32)
+        .reshape(shape)
+        .transpose(2, 0, 1)
+        for variable in variables
+    }
+    return GridField(times, latitudes, longitudes, fields)
+
+
+def heatmap_frames(field):
+    """One (columns, rows) nested list per hour.
+
+    This matches a heatmap grid series created with data_order="columns";
+    lists of lists are sent without another conversion per frame.
+    """
+    return [frame.tolist() for frame in field.transpose(0, 2, 1)]
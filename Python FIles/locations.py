@@ -0,0 +1,93 @@
+import collections
+import json
+import os
+
+from response_cache import cached_get_json
+
+# ─── Location Registry and Batched Multi-Location Requests ────────
+# Sites are registered by name; a dashboard process shows the site named by
+# WEATHER_LOCATION (default: Helsinki).  More sites can be listed in
+# locations.json in the project root:
+#     [{"name": "tampere", "label": "Tampere, Finland",
+#       "latitude": 61.4978, "longitude": 23.761, "timezone": "Europe/Helsinki"}]
+# fetch_batched() sends requests that differ only in their coordinates as one
+# Open-Meteo call with comma-separated latitudes/longitudes and splits the
+# returned list back into one payload per request.
+
+Location = collections.namedtuple(
+    "Location", ["name", "label", "latitude", "longitude", "timezone"]
+)
+
+LOCATIONS = {}
+LOCATIONS_FILE = "locations.json"
+DEFAULT_LOCATION = "helsinki"
+# Locations per multi-coordinate request
+MAX_BATCH = 100
+
+
+def register_location(name, label, latitude, longitude, timezone):
+    LOCATIONS[name] = Location(name, label, latitude, longitude, timezone)
+    return LOCATIONS[name]
+
+
+def load_locations(path=LOCATIONS_FILE):
+    """Register every site listed in `path`; a missing file is not an error."""
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    return [register_location(**entry) for entry in entries]
+
+
+def current_location():
+    """The site this process shows, from WEATHER_LOCATION."""
+    name = os.environ.get("WEATHER_LOCATION", DEFAULT_LOCATION)
+    if name not in LOCATIONS:
+        raise KeyError(
+            f"Unknown location {name!r}; registered: {', '.join(sorted(LOCATIONS))}"
+        )
+    return LOCATIONS[name]
+
+
+def fetch_batched(url, params_list, fetch=cached_get_json, batch_size=MAX_BATCH):
+    """Fetch every params dict, batching those that differ only in coordinates.
+
+    Returns the payloads in the order of `params_list`.
+    """
+    groups = collections.defaultdict(list)
+    for index, params in enumerate(params_list):
+        shared = tuple(
+            sorted(
+                (key, str(value))
+                for key, value in params.items()
+                if key not in ("latitude", "longitude")
+            )
+        )
+        groups[shared].append(index)
+
+    payloads = [None] * len(params_list)
+    for indexes in groups.values():
+        for first in range(0, len(indexes), batch_size):
+            batch = indexes[first : first + batch_size]
+            params = dict(params_list[batch[0]])
+            params["latitude"] = ",".join(
+                str(params_list[i]["latitude"]) for i in batch
+            )
+            params["longitude"] = ",".join(
+                str(params_list[i]["longitude"]) for i in batch
+            )
+            response = fetch(url, params)
+            # A single location comes back as an object, several as a list
+            responses = response if isinstance(response, list) else [response]
+            if len(responses) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} locations from {url}, got {len(responses)}"
+                )
+            for index, payload in zip(batch, responses):
+                payloads[index] = payload
+    return payloads
+
+
+register_location("helsinki", "Helsinki, Finland", 60.1699, 24.9384, "Europe/Helsinki")
+load_locations()
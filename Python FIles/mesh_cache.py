@@ -0,0 +1,193 @@
+import collections
+import os
+import threading
+
+import numpy as np
+import trimesh
+
+import metrics
+
+# ─── Shared Parsed-Mesh Cache ─────────────────────────────────────
+# Both dashboards load the same OBJ files over and over (every hourly slot on
+# every tick, the wind arrow once per day column).  Parsing and computing
+# vertex normals is by far the most expensive part of that, so each file is
+# parsed once per process and kept as flat typed arrays.
+
+MeshArrays = collections.namedtuple("MeshArrays", ["vertices", "indices", "normals"])
+
+# Upper bound for the summed array size of all cached meshes (bytes).
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+_cache = collections.OrderedDict()  # (real_path, source, mtime_ns) -> MeshArrays
+_cache_bytes = 0
+_hits = 0
+_misses = 0
+_lock = threading.Lock()
+
+# ─── Binary Mesh Bundles ──────────────────────────────────────────
+# `build_mesh_assets.py` converts each OBJ once into a ".meshbin" bundle next
+# to it.  Layout (little endian):
+#   8 bytes   magic b"LCMESH01"
+#   3 x u64   vertex float count, normal float count, index count
+#   float32[] vertices, float32[] normals, uint32[] indices
+# Bundles are memory-mapped, so loading them costs no parsing at all.
+BUNDLE_SUFFIX = ".meshbin"
+BUNDLE_MAGIC = b"LCMESH01"
+_HEADER = np.dtype([("magic", "S8"), ("counts", "<u8", (3,))])
+
+
+def _mesh_nbytes(mesh):
+    return mesh.vertices.nbytes + mesh.indices.nbytes + mesh.normals.nbytes
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+def parse_obj(path):
+    """Parse an OBJ file with trimesh into flat float32/uint32 arrays."""
+    scene = trimesh.load(path)
+    if isinstance(scene, trimesh.Scene):
+        mesh = scene.dump(concatenate=True)
+    else:
+        mesh = scene
+    return MeshArrays(
+        vertices=_readonly(
+            np.ascontiguousarray(mesh.vertices, dtype=np.float32).ravel()
+        ),
+        indices=_readonly(np.ascontiguousarray(mesh.faces, dtype=np.uint32).ravel()),
+        normals=_readonly(
+            np.ascontiguousarray(mesh.vertex_normals, dtype=np.float32).ravel()
+        ),
+    )
+
+
+def bundle_path(obj_path):
+    return os.path.splitext(obj_path)[0] + BUNDLE_SUFFIX
+
+
+def write_bundle(mesh, path):
+    """Write MeshArrays to a binary bundle (atomically replacing `path`)."""
+    vertices = np.ascontiguousarray(mesh.vertices, dtype="<f4").ravel()
+    normals = np.ascontiguousarray(mesh.normals, dtype="<f4").ravel()
+    indices = np.ascontiguousarray(mesh.indices, dtype="<u4").ravel()
+    header = np.zeros(1, dtype=_HEADER)
+    header["magic"] = BUNDLE_MAGIC
+    header["counts"] = (vertices.size, normals.size, indices.size)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.tobytes())
+        f.write(vertices.tobytes())
+        f.write(normals.tobytes())
+        f.write(indices.tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_bundle(path):
+    """Memory-map a binary bundle written by write_bundle."""
+    header = np.fromfile(path, dtype=_HEADER, count=1)
+    if header.size != 1 or header["magic"][0] != BUNDLE_MAGIC:
+        raise ValueError(f"Not a mesh bundle: {path}")
+    n_vertices, n_normals, n_indices = (int(n) for n in header["counts"][0])
+    offset = _HEADER.itemsize
+    vertices = np.memmap(
+        path, dtype="<f4", mode="r", offset=offset, shape=(n_vertices,)
+    )
+    offset += vertices.nbytes
+    normals = np.memmap(path, dtype="<f4", mode="r", offset=offset, shape=(n_normals,))
+    offset += normals.nbytes
+    indices = np.memmap(path, dtype="<u4", mode="r", offset=offset, shape=(n_indices,))
+    return MeshArrays(vertices=vertices, indices=indices, normals=normals)
+
+
+def _resolve_source(real_path):
+    """Pick the bundle if it exists and is not older than the OBJ."""
+    bundle = bundle_path(real_path)
+    try:
+        bundle_mtime = os.stat(bundle).st_mtime_ns
+    except OSError:
+        return real_path, os.stat(real_path).st_mtime_ns
+    try:
+        obj_mtime = os.stat(real_path).st_mtime_ns
+    except OSError:
+        return bundle, bundle_mtime
+    if bundle_mtime >= obj_mtime:
+        return bundle, bundle_mtime
+    return real_path, obj_mtime
+
+
+def _evict(limit):
+    global _cache_bytes
+    while _cache and _cache_bytes > limit:
+        _, evicted = _cache.popitem(last=False)
+        _cache_bytes -= _mesh_nbytes(evicted)
+
+
+def get_mesh(path):
+    """Return the cached MeshArrays for `path`, parsing it on first use.
+
+    A prebuilt binary bundle is used when present and up to date, otherwise
+    the OBJ itself is parsed.  Entries are keyed by the resolved path and
+    modification time, so editing an OBJ on disk is picked up on the next
+    call.  The returned arrays are shared and read-only.
+    """
+    global _cache_bytes, _hits, _misses
+    real_path = os.path.realpath(path)
+    source, mtime = _resolve_source(real_path)
+    key = (real_path, source, mtime)
+    with _lock:
+        mesh = _cache.get(key)
+        if mesh is not None:
+            _cache.move_to_end(key)
+            _hits += 1
+            metrics.count("mesh_cache_total", result="hit")
+            return mesh
+        _misses += 1
+    metrics.count("mesh_cache_total", result="miss")
+
+    with metrics.timer("mesh_load"):
+        if source == real_path:
+            mesh = parse_obj(real_path)
+        else:
+            try:
+                mesh = read_bundle(source)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring mesh bundle {source}: {e}")
+                mesh = parse_obj(real_path)
+
+    with _lock:
+        # Drop entries for older versions of the same file.
+        for stale_key in [k for k in _cache if k[0] == real_path]:
+            _cache_bytes -= _mesh_nbytes(_cache.pop(stale_key))
+        _cache[key] = mesh
+        _cache_bytes += _mesh_nbytes(mesh)
+        # Always keep the newest entry, even if it alone exceeds the limit.
+        _evict(max(MAX_CACHE_BYTES, _mesh_nbytes(mesh)))
+    return mesh
+
+
+def set_cache_limit(max_bytes):
+    """Change the cache size bound, evicting least recently used entries."""
+    global MAX_CACHE_BYTES
+    with _lock:
+        MAX_CACHE_BYTES = max_bytes
+        _evict(max_bytes)
+
+
+def clear_cache():
+    global _cache_bytes
+    with _lock:
+        _cache.clear()
+        _cache_bytes = 0
+
+
+def cache_info():
+    with _lock:
+        return {
+            "entries": len(_cache),
+            "bytes": _cache_bytes,
+            "max_bytes": MAX_CACHE_BYTES,
+            "hits": _hits,
+            "misses": _misses,
+        }
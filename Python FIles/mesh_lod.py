@@ -0,0 +1,155 @@
+import threading
+
+import numpy as np
+
+from mesh_cache import MeshArrays, get_mesh
+
+# ─── Mesh Level-of-Detail ─────────────────────────────────────────
+# Small dashboard cells (the 1x1 icon cells in real_time_bars.py) cannot show
+# the full detail of models like Snowflake.obj, yet every triangle is still
+# sent to the browser and rasterised.  Each mesh gets a chain of decimated
+# variants, and the variant drawn in a cell is chosen from the cell size and
+# the model scale.
+
+# Triangle budget for a model filling a full 1x1 dashboard cell.  Raise it
+# for sharper icons, lower it for slower (software-rendered) display boxes.
+TRIANGLES_PER_CELL = 1500
+# Never decimate below this many triangles.
+MIN_TRIANGLES = 200
+# Each level keeps this fraction of the previous level's triangles.
+LEVEL_RATIO = 0.5
+MAX_LEVELS = 6
+# Visible width of a Chart3D cell in world units with the camera at (0, 1, 5).
+VIEW_SIZE = 2.0
+
+_lod_cache = {}  # (path, level) -> (source MeshArrays, decimated MeshArrays)
+_lock = threading.Lock()
+
+
+def set_quality_budget(triangles_per_cell):
+    global TRIANGLES_PER_CELL
+    TRIANGLES_PER_CELL = triangles_per_cell
+
+
+def _vertex_normals(positions, faces):
+    """Area-weighted vertex normals (same convention as trimesh)."""
+    tri = positions[faces]
+    face_normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    normals = np.zeros_like(positions)
+    for corner in range(3):
+        np.add.at(normals, faces[:, corner], face_normals)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    lengths[lengths == 0] = 1
+    return normals / lengths
+
+
+def decimate(mesh, target_triangles):
+    """Reduce `mesh` to roughly `target_triangles` by vertex clustering.
+
+    Vertices are snapped to a uniform grid over the bounding box and merged
+    per grid cell; triangles that collapse are dropped and normals are
+    recomputed.  Coarse but fast enough to run at dashboard start-up.
+    """
+    positions = np.asarray(mesh.vertices, dtype=np.float32).reshape(-1, 3)
+    faces = np.asarray(mesh.indices, dtype=np.int64).reshape(-1, 3)
+    if len(faces) <= target_triangles:
+        return mesh
+
+    # A surface of N triangles has about N/2 vertices; start from a grid with
+    # that many cells over the largest face of the bounding box, then bisect
+    # the grid resolution until the result lands near the target.
+    low, high = 1, max(2, int(np.sqrt(len(faces))) * 4)
+    resolution = max(2, int(np.sqrt(target_triangles / 2)))
+    best = None
+    for _ in range(8):
+        new_positions, new_faces = _cluster(positions, faces, resolution)
+        if best is None or abs(len(new_faces) - target_triangles) < abs(
+            len(best[1]) - target_triangles
+        ):
+            best = (new_positions, new_faces)
+        if len(new_faces) < target_triangles * 0.9:
+            low = resolution
+        elif len(new_faces) > target_triangles * 1.1:
+            high = resolution
+        else:
+            break
+        if high - low <= 1:
+            break
+        resolution = (low + high) // 2
+
+    new_positions, new_faces = best
+    return MeshArrays(
+        vertices=new_positions.ravel(),
+        indices=new_faces.astype(np.uint32).ravel(),
+        normals=_vertex_normals(new_positions, new_faces).astype(np.float32).ravel(),
+    )
+
+
+def _cluster(positions, faces, resolution):
+    lower = positions.min(axis=0)
+    extent = np.maximum(positions.max(axis=0) - lower, 1e-9)
+    cell_size = extent.max() / resolution
+    grid = np.floor((positions - lower) / cell_size).astype(np.int64)
+    dims = grid.max(axis=0) + 1
+    cell_ids = (grid[:, 0] * dims[1] + grid[:, 1]) * dims[2] + grid[:, 2]
+
+    unique_cells, cluster = np.unique(cell_ids, return_inverse=True)
+    counts = np.bincount(cluster).astype(np.float32)
+    new_positions = np.zeros((len(unique_cells), 3), dtype=np.float32)
+    for axis in range(3):
+        new_positions[:, axis] = (
+            np.bincount(cluster, weights=positions[:, axis]) / counts
+        )
+
+    new_faces = cluster[faces]
+    keep = (
+        (new_faces[:, 0] != new_faces[:, 1])
+        & (new_faces[:, 1] != new_faces[:, 2])
+        & (new_faces[:, 0] != new_faces[:, 2])
+    )
+    new_faces = new_faces[keep]
+    if len(new_faces):
+        # Drop duplicates produced by merging (same triangle, any rotation).
+        _, first = np.unique(np.sort(new_faces, axis=1), axis=0, return_index=True)
+        new_faces = new_faces[np.sort(first)]
+    return new_positions, new_faces
+
+
+def triangle_budget(mesh, row_span=1, column_span=1, scale=1.0):
+    """Triangles worth drawing for `mesh` at `scale` in a cell of the given span."""
+    positions = np.asarray(mesh.vertices).reshape(-1, 3)
+    if not len(positions):
+        return 0
+    size = float(np.ptp(positions, axis=0).max()) * scale
+    coverage = min(1.0, size / VIEW_SIZE)
+    budget = TRIANGLES_PER_CELL * row_span * column_span * coverage**2
+    return max(MIN_TRIANGLES, int(budget))
+
+
+def get_lod_mesh(path, row_span=1, column_span=1, scale=1.0):
+    """Return the coarsest cached level of `path` that still meets the budget."""
+    mesh = get_mesh(path)
+    full_triangles = len(mesh.indices) // 3
+    target = triangle_budget(mesh, row_span, column_span, scale)
+
+    level = 0
+    triangles = full_triangles
+    while (
+        level < MAX_LEVELS
+        and triangles * LEVEL_RATIO >= target
+        and triangles * LEVEL_RATIO >= MIN_TRIANGLES
+    ):
+        level += 1
+        triangles *= LEVEL_RATIO
+    if level == 0:
+        return mesh
+
+    key = (path, level)
+    with _lock:
+        cached = _lod_cache.get(key)
+    if cached is not None and cached[0] is mesh:
+        return cached[1]
+    lod = decimate(mesh, int(full_triangles * LEVEL_RATIO**level))
+    with _lock:
+        _lod_cache[key] = (mesh, lod)
+    return lod
@@ -0,0 +1,226 @@
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ─── Stage Metrics in Prometheus Text Format ──────────────────────
+# Timers (histograms of seconds) and counters around the pipeline stages:
+# fetch, json_parse, decode, aggregate, mesh_load, geometry_upload and
+# widget_update.  Nothing is recorded unless WEATHER_METRICS_PORT is set
+# (serves http://<WEATHER_METRICS_HOST>:<port>/metrics) or WEATHER_METRICS_FILE
+# is (rewritten every WRITE_INTERVAL seconds and at exit, e.g. for the
+# node_exporter textfile collector).
+# The same timers feed benchmarks/run_benchmarks.py: with WEATHER_BENCH_LOG set,
+# every timed stage and mark() is appended to that file as one JSON line
+# ({"name", "end", "seconds"}, wall-clock end time).  With none of the three
+# set, timed() returns the function unchanged and timer() / count() / mark()
+# return straight away.
+
+METRICS_PORT = os.environ.get("WEATHER_METRICS_PORT")
+METRICS_HOST = os.environ.get("WEATHER_METRICS_HOST", "127.0.0.1")
+METRICS_FILE = os.environ.get("WEATHER_METRICS_FILE")
+BENCH_LOG = os.environ.get("WEATHER_BENCH_LOG")
+ENABLED = bool(METRICS_PORT or METRICS_FILE)
+TIMING = ENABLED or bool(BENCH_LOG)
+
+PREFIX = "weather_"
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WRITE_INTERVAL = 15.0
+DESCRIPTIONS = {
+    "stage_seconds": "Time spent per pipeline stage",
+    "fetch_errors_total": "Failed Open-Meteo requests, including retried ones",
+    "fetch_retries_total": "Open-Meteo requests retried after a failure",
+    "fetch_served_stale_total": "Requests answered with the last good response",
+    "response_cache_total": "Response cache lookups by result",
+    "mesh_cache_total": "Mesh cache lookups by result",
+    "geometry_upload_bytes_total": "Geometry buffer bytes sent to mesh models",
+    "widget_update_errors_total": "Widget updates that raised",
+}
+
+_histograms = {}  # (name, labels) -> [per-bucket counts..., +Inf count, sum]
+_counters = {}  # (name, labels) -> value
+_lock = threading.Lock()
+_bench_lock = threading.Lock()
+_marked = set()
+_started = False
+_NULL_TIMER = nullcontext()
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def observe(name, seconds, **labels):
+    """Add one observation to the histogram `name`."""
+    if not ENABLED:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [0] * (len(BUCKETS) + 2)
+        histogram[bisect.bisect_left(BUCKETS, seconds)] += 1
+        histogram[-1] += seconds
+
+
+def count(name, amount=1, **labels):
+    """Increase the counter `name` by `amount`."""
+    if not ENABLED:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def _emit(name, seconds):
+    line = json.dumps({"name": name, "end": time.time(), "seconds": seconds})
+    with _bench_lock, open(BENCH_LOG, "a") as f:
+        f.write(line + "\n")
+
+
+def mark(name, once=False):
+    """Log a benchmark point in time (e.g. "first_paint"); `once` logs the first."""
+    if not BENCH_LOG or (once and name in _marked):
+        return
+    _marked.add(name)
+    _emit(name, 0.0)
+
+
+class _Timer:
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.started
+        observe("stage_seconds", seconds, stage=self.stage)
+        if BENCH_LOG:
+            _emit(self.stage, seconds)
+
+
+def timer(stage):
+    """Context manager timing a block as `stage`."""
+    return _Timer(stage) if TIMING else _NULL_TIMER
+
+
+def timed(stage):
+    """Decorator timing every call as `stage`."""
+
+    def decorate(function):
+        if not TIMING:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _Timer(stage):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+# ─── Export ───────────────────────────────────────────────────────
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _series(name, labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return PREFIX + name
+    text = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return f"{PREFIX}{name}{{{text}}}"
+
+
+def _header(lines, name, kind):
+    if name in DESCRIPTIONS:
+        lines.append(f"# HELP {PREFIX}{name} {DESCRIPTIONS[name]}")
+    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        histograms = {key: list(value) for key, value in _histograms.items()}
+        counters = dict(_counters)
+    lines = []
+    for name in sorted({name for name, _ in histograms}):
+        _header(lines, name, "histogram")
+        for (_, labels), values in sorted(
+            item for item in histograms.items() if item[0][0] == name
+        ):
+            cumulative = 0
+            for bound, bucket in zip((*BUCKETS, "+Inf"), values[:-1]):
+                cumulative += bucket
+                lines.append(
+                    f"{_series(name + '_bucket', labels, [('le', bound)])} {cumulative}"
+                )
+            lines.append(f"{_series(name + '_sum', labels)} {values[-1]}")
+            lines.append(f"{_series(name + '_count', labels)} {cumulative}")
+    for name in sorted({name for name, _ in counters}):
+        _header(lines, name, "counter")
+        for (_, labels), value in sorted(
+            item for item in counters.items() if item[0][0] == name
+        ):
+            lines.append(f"{_series(name, labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_file(path=METRICS_FILE):
+    """Atomically replace `path` with the current metrics."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        f.write(render())
+    os.replace(temporary, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        data = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_loop(path):
+    while True:
+        time.sleep(WRITE_INTERVAL)
+        try:
+            write_file(path)
+        except OSError as e:
+            print(f"Could not write metrics file: {e}")
+
+
+def start():
+    """Start the configured exporters (once); a no-op when metrics are off."""
+    global _started
+    if not ENABLED or _started:
+        return
+    _started = True
+    if METRICS_PORT:
+        server = ThreadingHTTPServer((METRICS_HOST, int(METRICS_PORT)), _MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"Serving metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    if METRICS_FILE:
+        threading.Thread(target=_write_loop, args=(METRICS_FILE,), daemon=True).start()
+        atexit.register(write_file, METRICS_FILE)
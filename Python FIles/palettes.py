@@ -0,0 +1,39 @@
+import lightningchart as lc
+
+# ─── Shared Color Palettes ────────────────────────────────────────
+# (value, color) stops used by the dashboards' palette-colored charts; turn
+# them into LightningChart steps with palette_steps().
+
+WIND_SPEED = [(0, "blue"), (5, "green"), (10, "yellow"), (15, "red")]
+SOIL_TEMPERATURE = [(-10, "red"), (0, "orange"), (10, "yellow"), (20, "green")]
+SOIL_MOISTURE = [(0, "red"), (0.5, "orange"), (0.75, "yellow"), (1, "green")]
+CLOUD_COVER = [
+    (0, "blue"),
+    (0.25, "cyan"),
+    (0.50, "green"),
+    (0.75, "yellow"),
+    (0.100, "red"),
+]
+TEMPERATURE = [(-30, "blue"), (-10, "cyan"), (0, "green"), (15, "yellow"), (30, "red")]
+RELATIVE_HUMIDITY = [(0, "red"), (40, "yellow"), (70, "green"), (100, "blue")]
+PRECIPITATION = [(0, "white"), (1, "cyan"), (5, "blue"), (10, "purple")]
+CLOUD_COVER_PERCENT = [
+    (0, "blue"),
+    (25, "cyan"),
+    (50, "green"),
+    (75, "yellow"),
+    (100, "red"),
+]
+
+# Palette per hourly Open-Meteo variable, for gridded (heatmap) views
+VARIABLE_PALETTES = {
+    "temperature_2m": TEMPERATURE,
+    "wind_speed_10m": WIND_SPEED,
+    "relative_humidity_2m": RELATIVE_HUMIDITY,
+    "precipitation": PRECIPITATION,
+    "cloud_cover": CLOUD_COVER_PERCENT,
+}
+
+
+def palette_steps(stops):
+    return [{"value": value, "color": lc.Color(color)} for value, color in stops]
@@ -0,0 +1,101 @@
+import math
+import threading
+import time
+
+import numpy as np
+
+import metrics
+
+# ─── Columnar Historical Playback ─────────────────────────────────
+# Every frame payload is built once up front from column arrays; playback then
+# only hands the prepared payloads to a render callback at the chosen speed.
+# At 1x a frame is shown for FRAME_SECONDS (the pace of the original loop);
+# speed=FASTEST renders frames back to back.  Playback can be paused, resumed,
+# seeked to a timestamp and looped from any thread while it runs.
+
+FRAME_SECONDS = 1.0
+FASTEST = math.inf
+
+
+class PlaybackEngine:
+    def __init__(self, times, frames, render, speed=1.0, loop=False):
+        """`times` are sorted frame timestamps, `frames` the matching payloads.
+
+        `render(frame)` is called for every frame that is played.
+        """
+        self.times = np.asarray(times)
+        self.frames = list(frames)
+        if len(self.times) != len(self.frames):
+            raise ValueError("times and frames must have the same length")
+        self.render = render
+        self.speed = speed
+        self.loop = loop
+        self.position = 0
+        self.frames_rendered = 0
+        self._paused = False
+        self._stopped = False
+        self._changed = threading.Condition()
+
+    def __len__(self):
+        return len(self.frames)
+
+    def set_speed(self, speed):
+        """Playback speed as a multiple of 1 frame per FRAME_SECONDS."""
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        with self._changed:
+            self.speed = speed
+            self._changed.notify_all()
+
+    def pause(self):
+        with self._changed:
+            self._paused = True
+
+    def resume(self):
+        with self._changed:
+            self._paused = False
+            self._changed.notify_all()
+
+    def stop(self):
+        with self._changed:
+            self._stopped = True
+            self._changed.notify_all()
+
+    def seek(self, timestamp):
+        """Continue from the first frame at or after `timestamp`."""
+        with self._changed:
+            self.position = int(np.searchsorted(self.times, timestamp))
+            self._changed.notify_all()
+
+    def _frame_interval(self):
+        return 0.0 if self.speed == FASTEST else FRAME_SECONDS / self.speed
+
+    def play(self):
+        """Render frames on the calling thread until the end (or stop())."""
+        while True:
+            with self._changed:
+                while self._paused and not self._stopped:
+                    self._changed.wait()
+                if self._stopped:
+                    return
+                if self.position >= len(self.frames):
+                    if not self.loop or not self.frames:
+                        return
+                    self.position = 0
+                index = self.position
+                self.position += 1
+            started = time.monotonic()
+            with metrics.timer("widget_update"):
+                self.render(self.frames[index])
+            self.frames_rendered += 1
+            remaining = self._frame_interval() - (time.monotonic() - started)
+            if remaining > 0:
+                with self._changed:
+                    # Woken early by seek/speed/pause changes
+                    self._changed.wait(remaining)
+
+    def start(self):
+        """Play on a background thread; returns the thread."""
+        thread = threading.Thread(target=self.play, daemon=True)
+        thread.start()
+        return thread
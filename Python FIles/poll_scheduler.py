@@ -0,0 +1,138 @@
+import collections
+import heapq
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+import metrics
+
+# ─── Adaptive Polling Scheduler ───────────────────────────────────
+# Open-Meteo reports how often "current" values change (current.interval,
+# usually 900 s).  Instead of polling on a fixed short sleep, each registered
+# poller is scheduled just after the next upstream update, with jitter, error
+# backoff and a shared hourly request budget.
+
+# Seconds to wait after the expected upstream update before fetching
+UPDATE_DELAY = 30
+JITTER = 15
+# Used when the payload has no interval or the upstream update is late
+MIN_INTERVAL = 60
+DEFAULT_INTERVAL = 900
+ERROR_BACKOFF_BASE = 10
+ERROR_BACKOFF_MAX = 15 * 60
+REQUESTS_PER_HOUR = 60
+
+
+def next_update_time(payload, now=None):
+    """Epoch seconds at which the payload's "current" block is next refreshed."""
+    now = time.time() if now is None else now
+    current = (payload or {}).get("current") or {}
+    interval = current.get("interval") or DEFAULT_INTERVAL
+    observed = current.get("time")
+    if isinstance(observed, str):
+        observed = datetime.strptime(observed, "%Y-%m-%dT%H:%M").replace(
+            tzinfo=timezone.utc
+        ).timestamp() - payload.get("utc_offset_seconds", 0)
+    if observed is None:
+        return now + interval
+    due = observed + interval
+    if due <= now:
+        # Upstream is late; check again soon rather than hammering it.
+        return now + MIN_INTERVAL
+    return due
+
+
+class PollScheduler:
+    def __init__(self, requests_per_hour=REQUESTS_PER_HOUR):
+        self.requests_per_hour = requests_per_hour
+        self._queue = []  # (due, sequence, name)
+        self._pollers = {}
+        self._sent = collections.deque()  # epoch seconds of recent requests
+        self._sequence = 0
+        self._wakeup = threading.Condition()
+        self._thread = None
+
+    def register(
+        self, name, fetch, on_data, interval=None, on_error=None, first_due=None
+    ):
+        """Poll `fetch()` and pass each result to `on_data(result)`.
+
+        Without a fixed `interval`, the next poll is aligned to the upstream
+        update time reported in the result (see next_update_time).  The first
+        poll runs at `first_due` (epoch seconds), or right away.
+        """
+        with self._wakeup:
+            self._pollers[name] = {
+                "fetch": fetch,
+                "on_data": on_data,
+                "on_error": on_error,
+                "interval": interval,
+                "failures": 0,
+            }
+            self._push(time.time() if first_due is None else first_due, name)
+        return self
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _push(self, due, name):
+        self._sequence += 1
+        heapq.heappush(self._queue, (due, self._sequence, name))
+        self._wakeup.notify()
+
+    def _budget_wait(self, now):
+        while self._sent and self._sent[0] <= now - 3600:
+            self._sent.popleft()
+        if len(self._sent) < self.requests_per_hour:
+            return 0
+        return self._sent[0] + 3600 - now
+
+    def _next_due(self):
+        with self._wakeup:
+            while True:
+                now = time.time()
+                if not self._queue:
+                    self._wakeup.wait()
+                    continue
+                due, _, name = self._queue[0]
+                wait = max(due - now, self._budget_wait(now))
+                if wait > 0:
+                    self._wakeup.wait(wait)
+                    continue
+                heapq.heappop(self._queue)
+                self._sent.append(now)
+                return name, self._pollers[name]
+
+    def _run(self):
+        while True:
+            name, poller = self._next_due()
+            try:
+                result = poller["fetch"]()
+                with metrics.timer("widget_update"):
+                    poller["on_data"](result)
+            except Exception as e:
+                poller["failures"] += 1
+                delay = min(
+                    ERROR_BACKOFF_MAX, ERROR_BACKOFF_BASE * 2 ** poller["failures"]
+                )
+                print(f"Poller {name} failed ({e}); retrying in {delay:.0f} s")
+                if poller["on_error"]:
+                    # A failing handler must not end the thread for every poller
+                    try:
+                        poller["on_error"](e)
+                    except Exception as handler_error:
+                        print(f"Error handler of poller {name} failed: {handler_error}")
+                due = time.time() + random.uniform(delay / 2, delay)
+            else:
+                poller["failures"] = 0
+                if poller["interval"]:
+                    due = time.time() + poller["interval"]
+                else:
+                    due = next_update_time(result) + UPDATE_DELAY
+                due += random.uniform(0, JITTER)
+            with self._wakeup:
+                self._push(due, name)
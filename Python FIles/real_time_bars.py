@@ -1,25 +1,53 @@
 import requests
-import pandas as pd
+import numpy as np
 import lightningchart as lc
-import trimesh
+import os
+import threading
 import time
 from datetime import datetime, timedelta
 import pytz
 
+from mesh_cache import get_mesh
+from mesh_lod import get_lod_mesh
+from geometry import geometry_nbytes, upload_geometry
+from weather_client import FORECAST_URL
+from weather_store import StoreBackedFetch, location_key
+from locations import current_location
+import palettes
+from fetch_planner import FetchPlanner
+from data_engine import DataEngine
+from render_pipeline import RenderPipeline
+from animation import Animator
+from playback import FASTEST, PlaybackEngine
+from series_batch import SeriesBatcher
+from series_retention import RetainedSeries, WindowFitter
+from downsample import ZoomResampler, chart_width
+import metrics
+from response_decoder import (
+    MISSING_CODE,
+    UNIXTIME_PARAMS,
+    code_value,
+    decode_columns,
+)
+
 # ─── Read License Key and Set Timezone ─────────────────────────────
 with open(
     "D:/Computer Aplication/WorkPlacement/Projects/shared_variable.txt", "r"
 ) as f:
     mylicensekey = f.read().strip()
 lc.set_license(mylicensekey)
+# Stage timers and counters, exported when WEATHER_METRICS_PORT/_FILE is set
+metrics.start()
 
-local_tz = pytz.timezone("Europe/Helsinki")
+# Site shown by this process (WEATHER_LOCATION, default Helsinki)
+LOCATION = current_location()
+local_tz = pytz.timezone(LOCATION.timezone)
 
 # ─── API Parameters for Real-Time / Historical Data ───────────────
-API_URL = "https://api.open-meteo.com/v1/forecast"
+API_URL = FORECAST_URL
 API_PARAMS = {
-    "latitude": 60.1699,
-    "longitude": 24.9384,
+    "latitude": LOCATION.latitude,
+    "longitude": LOCATION.longitude,
     "current": "temperature_2m,precipitation,rain,showers,snowfall,weather_code,cloud_cover,"
     "wind_speed_10m,wind_direction_10m,relative_humidity_2m,pressure_msl,"
     "soil_temperature_0_to_7cm,soil_temperature_7_to_28cm,soil_temperature_28_to_100cm,soil_temperature_100_to_255cm,"
@@ -31,36 +59,81 @@ API_PARAMS = {
     "past_days": 1,
     "forecast_days": 0,  # only historical/current data here
     "timezone": "auto",
+    **UNIXTIME_PARAMS,
 }
+# Hourly history only, served from the local store plus any missing hours
+PAST_PARAMS = {key: value for key, value in API_PARAMS.items() if key != "current"}
+history_fetch = StoreBackedFetch(local_tz)
 
 
 # ─── Function to Fetch Forecast Data (for Hourly Charts) ───────
+FORECAST_HOURLY_VARIABLES = [
+    "temperature_2m",
+    "weather_code",
+    "relative_humidity_2m",
+    "pressure_msl",
+    "wind_speed_10m",
+    "precipitation",
+    "snowfall",
+]
+CURRENT_VARIABLES = API_PARAMS["current"].split(",")
+CLOUD_VARIABLES = [
+    "cloud_cover",
+    "cloud_cover_low",
+    "cloud_cover_mid",
+    "cloud_cover_high",
+]
+
+
+FORECAST_PARAMS = {
+    "latitude": LOCATION.latitude,
+    "longitude": LOCATION.longitude,
+    # Request forecast_days = 2 so that later hours (e.g. 00:00) are available.
+    "hourly": ",".join(FORECAST_HOURLY_VARIABLES),
+    "past_days": 1,
+    "forecast_days": 2,
+    "timezone": "auto",
+    **UNIXTIME_PARAMS,
+}
+
+
+def parse_weather_data(data):
+    # Typed columns: "time" holds unix seconds (UTC), sorted ascending
+    return decode_columns(data.get("hourly", {}))
+
+
 def fetch_weather_data():
-    params = {
-        "latitude": 60.1699,
-        "longitude": 24.9384,
-        # Request forecast_days = 2 so that later hours (e.g. 00:00) are available.
-        "hourly": "temperature_2m,weather_code,relative_humidity_2m,pressure_msl,wind_speed_10m,precipitation,snowfall",
-        "past_days": 1,
-        "forecast_days": 2,
-        "timezone": "auto",
-    }
     try:
-        response = requests.get(API_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-        hourly_data = data.get("hourly", {})
-        df = pd.DataFrame(hourly_data)
-        # IMPORTANT: Assume the API time strings are in UTC;
-        # convert them to local Helsinki time:
-        df["Time"] = (
-            pd.to_datetime(df["time"]).dt.tz_localize("UTC").dt.tz_convert(local_tz)
-        )
-        df.sort_values(by="Time", inplace=True)
-        return df
+        return parse_weather_data(history_fetch(API_URL, FORECAST_PARAMS))
     except requests.exceptions.RequestException as e:
         print(f"Error fetching weather data: {e}")
-        return pd.DataFrame()
+        return decode_columns({})
+
+
+# ─── Real-Time Fetch Plan ─────────────────────────────────────────
+# Everything the real-time loop needs is merged into one request per tick
+realtime_planner = FetchPlanner(API_URL, base_params=UNIXTIME_PARAMS)
+realtime_planner.register(
+    "current",
+    API_PARAMS["latitude"],
+    API_PARAMS["longitude"],
+    current=CURRENT_VARIABLES,
+)
+realtime_planner.register(
+    "next_hours",
+    API_PARAMS["latitude"],
+    API_PARAMS["longitude"],
+    hourly=FORECAST_HOURLY_VARIABLES,
+    past_days=1,
+    forecast_days=2,
+)
+realtime_planner.register(
+    "clouds",
+    API_PARAMS["latitude"],
+    API_PARAMS["longitude"],
+    hourly=CLOUD_VARIABLES,
+    forecast_days=1,
+)
 
 
 # ─── Weather Mapping ──────────────────────────────────────────────
@@ -111,16 +184,9 @@ mesh_models = {}
 
 
 def load_mesh_model(obj_filename):
-    obj_path = f"Dataset/{obj_filename}"
-    scene = trimesh.load(obj_path)
-    if isinstance(scene, trimesh.Scene):
-        mesh = scene.dump(concatenate=True)
-    else:
-        mesh = scene
-    vertices = mesh.vertices.flatten().tolist()
-    indices = mesh.faces.flatten().tolist()
-    normals = mesh.vertex_normals.flatten().tolist()
-    return vertices, indices, normals
+    # Parsed (or memory-mapped from a prebuilt bundle) once per process and
+    # kept as typed arrays; hand the result to upload_geometry.
+    return get_mesh(f"Dataset/{obj_filename}")
 
 
 unique_weather_codes = [
@@ -156,43 +222,57 @@ unique_weather_codes = [
 for code in unique_weather_codes:
     obj_file = weather_mapping.get(code, None)
     if obj_file and obj_file not in mesh_models:
-        vertices, indices, normals = load_mesh_model(obj_file)
         model = chart_3d.add_mesh_model()
-        model.set_model_geometry(vertices=vertices, indices=indices, normals=normals)
+        upload_geometry(model, load_mesh_model(obj_file), label=obj_file)
         model.set_scale(1)
         model.set_model_location(8, 0, 0)
         mesh_models[obj_file] = model
 
 
+# Slide animations run on the animator's frame thread, so a weather change
+# never blocks the data loop.
+animator = Animator()
+TRANSITION_DURATION = 2.0  # seconds per slide
+
+
 def transition_weather(prev_obj, new_obj):
     if prev_obj == new_obj:
         return
-    transition_steps = 40
-    delay = 0.05
     prev_model = mesh_models.get(prev_obj, None)
     new_model = mesh_models.get(new_obj, None)
     if prev_model:
-        for step in range(transition_steps):
-            prev_model.set_model_location(0 - (step / transition_steps), 0, 0)
-            time.sleep(delay)
-        prev_model.set_model_location(-8, 0, 0)
+        # Slide out to the left, then park offscreen
+        animator.slide(
+            prev_obj,
+            prev_model,
+            to=(-1, 0, 0),
+            duration=TRANSITION_DURATION,
+            on_done=lambda: prev_model.set_model_location(-8, 0, 0),
+        )
     if new_model:
-        new_model.set_model_location(2, 0, 0)
-        for step in range(transition_steps):
-            new_model.set_model_location(2 - (step / transition_steps * 2), 0, 0)
-            time.sleep(delay)
+        # Slide in from the right once the previous model has left
+        animator.slide(
+            new_obj,
+            new_model,
+            start=(2, 0, 0),
+            to=(0, 0, 0),
+            duration=TRANSITION_DURATION,
+            delay=TRANSITION_DURATION if prev_model else 0.0,
+        )
+
+
+def parse_past_weather(data):
+    """Decoded hourly columns of the fully past (local) days only."""
+    columns = decode_columns(data.get("hourly", {}))
+    today_start = datetime.now(local_tz).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    keep = columns["time"] < today_start.timestamp()
+    return {name: column[keep] for name, column in columns.items()}
 
 
 def fetch_past_weather():
-    response = requests.get(API_URL, params=API_PARAMS)
-    response.raise_for_status()
-    data = response.json()
-    hourly_data = data.get("hourly", {})
-    df = pd.DataFrame(hourly_data)
-    df["Time"] = pd.to_datetime(df["time"])
-    today = datetime.utcnow().date()
-    df = df[df["Time"].dt.date < today]
-    return df
+    return parse_past_weather(history_fetch(API_URL, PAST_PARAMS))
 
 
 def get_weather_obj(weather_code):
@@ -218,12 +298,6 @@ def get_weather_obj(weather_code):
         return None
 
 
-def fetch_real_time_weather():
-    response = requests.get(API_URL, params=API_PARAMS)
-    response.raise_for_status()
-    return response.json()["current"]
-
-
 # ─── Other Dashboard Charts (Polar, Gauge, Bar, Multi-Line) ───────
 polar_chart = dashboard.PolarChart(
     column_index=0, row_index=0, row_span=4, column_span=4
@@ -234,12 +308,7 @@ sectors = 12
 annuli = 5
 heatmap_series = polar_chart.add_heatmap_series(sectors=sectors, annuli=annuli)
 heatmap_series.set_palette_coloring(
-    steps=[
-        {"value": 0, "color": lc.Color("blue")},
-        {"value": 5, "color": lc.Color("green")},
-        {"value": 10, "color": lc.Color("yellow")},
-        {"value": 15, "color": lc.Color("red")},
-    ],
+    steps=palettes.palette_steps(palettes.WIND_SPEED),
     look_up_property="value",
     interpolate=True,
 )
@@ -264,12 +333,7 @@ bar_chart_temp.set_data(
     [{"category": d, "value": 0} for d in soil_categories]
 ).set_sorting("disabled")
 bar_chart_temp.set_palette_colors(
-    steps=[
-        {"value": -10, "color": lc.Color("red")},
-        {"value": 0, "color": lc.Color("orange")},
-        {"value": 10, "color": lc.Color("yellow")},
-        {"value": 20, "color": lc.Color("green")},
-    ]
+    steps=palettes.palette_steps(palettes.SOIL_TEMPERATURE)
 )
 
 bar_chart_moisture = dashboard.BarChart(
@@ -281,12 +345,7 @@ bar_chart_moisture.set_data(
     [{"category": d, "value": 0} for d in moisture_categories]
 ).set_sorting("disabled")
 bar_chart_moisture.set_palette_colors(
-    steps=[
-        {"value": 0, "color": lc.Color("red")},
-        {"value": 0.5, "color": lc.Color("orange")},
-        {"value": 0.75, "color": lc.Color("yellow")},
-        {"value": 1, "color": lc.Color("green")},
-    ]
+    steps=palettes.palette_steps(palettes.SOIL_MOISTURE)
 )
 
 # NEW: Cloud Coverage Bar Chart
@@ -299,13 +358,7 @@ bar_chart_cloud.set_data(
     [{"category": cat, "value": 0} for cat in cloud_categories]
 ).set_sorting("disabled")
 bar_chart_cloud.set_palette_colors(
-    steps=[
-        {"value": 0, "color": lc.Color("blue")},
-        {"value": 0.25, "color": lc.Color("cyan")},
-        {"value": 0.50, "color": lc.Color("green")},
-        {"value": 0.75, "color": lc.Color("yellow")},
-        {"value": 0.100, "color": lc.Color("red")},
-    ],
+    steps=palettes.palette_steps(palettes.CLOUD_COVER),
     look_up_property="x",
 )
 
@@ -320,13 +373,48 @@ weather_features = [
     "Pressure (hPa)",
     "Precipitation (mm)",
 ]
+# Trend history kept on the chart: the last 48 hours, at most 4096 points each
+TREND_RETENTION_SPAN = 48 * 3600 * 1000  # ms
+TREND_RETENTION_POINTS = 4096
 series_dict = {}
+trend_axes = {}
 for i, feature in enumerate(weather_features):
     axis_y = line_chart.add_y_axis(stack_index=i)
     series = line_chart.add_line_series(y_axis=axis_y, data_pattern="ProgressiveX")
     series.set_name(feature)
-    series_dict[feature] = series
+    series_dict[feature] = RetainedSeries(
+        series, max_points=TREND_RETENTION_POINTS, span=TREND_RETENTION_SPAN
+    )
+    trend_axes[feature] = axis_y
     legend_line.add(series)
+trend_fitter = WindowFitter(line_chart.get_default_x_axis(), series_dict, trend_axes)
+# Hourly variable plotted by each trend series
+TREND_VARIABLES = {
+    "Wind Speed (km/h)": "wind_speed_10m",
+    "Humidity (%)": "relative_humidity_2m",
+    "Pressure (hPa)": "pressure_msl",
+    "Precipitation (mm)": "precipitation",
+}
+trend_batcher = SeriesBatcher(series_dict)
+
+
+def stored_trends(start, end):
+    """Trend points in [start, end) (ms) from the local store, for zooming out."""
+    columns = history_fetch.store.read(
+        location_key(LOCATION.latitude, LOCATION.longitude),
+        list(TREND_VARIABLES.values()),
+        start // 1000,
+        -(-end // 1000),
+    )
+    x = columns["time"] * 1000
+    return {
+        feature: (x, columns[variable]) for feature, variable in TREND_VARIABLES.items()
+    }
+
+
+# Held for every change to the trend series; zoom resampling runs on the
+# chart's event thread and takes it too
+trend_lock = threading.Lock()
 
 # ─── Additional Forecast / Alert / Hourly Forecast Charts ─────────
 # (Forecast title and cloud model remain as in your original code.)
@@ -343,11 +431,13 @@ forcasting_text.add_textbox("Hourly Weather Forecast", 0.5, 0.5).set_text_font(
     "20", weight="bold"
 ).set_stroke(thickness=0, color=lc.Color("black"))
 
+# Icon meshes are decimated to a level that suits their 1x1 cell and scale
+# (see mesh_lod.TRIANGLES_PER_CELL for the quality budget).
 chart_3d_weather = dashboard.Chart3D(
     row_index=9, column_index=4, row_span=1, column_span=1
 ).set_title("")
-object_weather = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project19/Weekly dash/cloud.obj"
+object_weather = get_lod_mesh(
+    "Weekly dash/cloud.obj", row_span=1, column_span=1, scale=0.006
 )
 chart_3d_weather.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -359,13 +449,8 @@ chart_3d_weather.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_weather.set_camera_location(0, 1, 5)
-vertices_weather = object_weather.vertices.flatten().tolist()
-indices_weather = object_weather.faces.flatten().tolist()
-normals_weather = object_weather.vertex_normals.flatten().tolist()
 model_weather = chart_3d_weather.add_mesh_model().set_color(lc.Color("white"))
-model_weather.set_model_geometry(
-    vertices=vertices_weather, indices=indices_weather, normals=normals_weather
-)
+upload_geometry(model_weather, object_weather, label="weather icon")
 model_weather.set_scale(0.006).set_model_location(1, 0.3, 0).set_model_rotation(0, 0, 0)
 
 chart_text_weather = dashboard.ChartXY(
@@ -385,8 +470,8 @@ chart_text_weather.add_textbox("Weather", 0.5, 0.5).set_text_font(
 chart_3d_alert = dashboard.Chart3D(
     row_index=10, column_index=4, row_span=1, column_span=1
 ).set_title("")
-object_alert = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project19/Weekly dash/alert.obj"
+object_alert = get_lod_mesh(
+    "Weekly dash/alert.obj", row_span=1, column_span=1, scale=1.5
 )
 chart_3d_alert.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -398,13 +483,8 @@ chart_3d_alert.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_alert.set_camera_location(0, 1, 5)
-vertices_alert = object_alert.vertices.flatten().tolist()
-indices_alert = object_alert.faces.flatten().tolist()
-normals_alert = object_alert.vertex_normals.flatten().tolist()
 model_alert = chart_3d_alert.add_mesh_model().set_color(lc.Color("red"))
-model_alert.set_model_geometry(
-    vertices=vertices_alert, indices=indices_alert, normals=normals_alert
-)
+upload_geometry(model_alert, object_alert, label="alert icon")
 model_alert.set_scale(1.5).set_model_location(1, 0.3, 0).set_model_rotation(90, 0, 0)
 chart_alert_alert = dashboard.ChartXY(
     row_index=10, column_index=5, row_span=1, column_span=1
@@ -423,8 +503,8 @@ chart_alert_alert.add_textbox("Alert", 0.5, 0.5).set_text_font(
 chart_3d_temp = dashboard.Chart3D(
     row_index=11, column_index=4, row_span=1, column_span=1
 ).set_title("")
-object_temp = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project19/Weekly dash/Snowflake.obj"
+object_temp = get_lod_mesh(
+    "Weekly dash/Snowflake.obj", row_span=1, column_span=1, scale=0.4
 )
 chart_3d_temp.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -436,13 +516,8 @@ chart_3d_temp.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_temp.set_camera_location(0, 1, 5)
-vertices_temp = object_temp.vertices.flatten().tolist()
-indices_temp = object_temp.faces.flatten().tolist()
-normals_temp = object_temp.vertex_normals.flatten().tolist()
 model_temp = chart_3d_temp.add_mesh_model().set_color(lc.Color("white"))
-model_temp.set_model_geometry(
-    vertices=vertices_temp, indices=indices_temp, normals=normals_temp
-)
+upload_geometry(model_temp, object_temp, label="temp icon")
 model_temp.set_scale(0.4).set_model_location(1, 0.3, 0).set_model_rotation(90, 0, 0)
 chart_alert_temp = dashboard.ChartXY(
     row_index=11, column_index=5, row_span=1, column_span=1
@@ -461,8 +536,8 @@ chart_alert_temp.add_textbox("Temperature", 0.5, 0.5).set_text_font(
 chart_3d_humidity = dashboard.Chart3D(
     row_index=12, column_index=4, row_span=1, column_span=1
 ).set_title("")
-object_humidity = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project19/Weekly dash/humidity.obj"
+object_humidity = get_lod_mesh(
+    "Weekly dash/humidity.obj", row_span=1, column_span=1, scale=0.4
 )
 chart_3d_humidity.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -474,13 +549,8 @@ chart_3d_humidity.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_humidity.set_camera_location(0, 1, 5)
-vertices_humidity = object_humidity.vertices.flatten().tolist()
-indices_humidity = object_humidity.faces.flatten().tolist()
-normals_humidity = object_humidity.vertex_normals.flatten().tolist()
 model_humidity = chart_3d_humidity.add_mesh_model().set_color(lc.Color(102, 178, 255))
-model_humidity.set_model_geometry(
-    vertices=vertices_humidity, indices=indices_humidity, normals=normals_humidity
-)
+upload_geometry(model_humidity, object_humidity, label="humidity icon")
 model_humidity.set_scale(0.4).set_model_location(1, 0.3, 0).set_model_rotation(0, 0, 0)
 chart_alert_humidity = dashboard.ChartXY(
     row_index=12, column_index=5, row_span=1, column_span=1
@@ -499,8 +569,8 @@ chart_alert_humidity.add_textbox("Humidity", 0.5, 0.5).set_text_font(
 chart_3d_pressure = dashboard.Chart3D(
     row_index=13, column_index=4, row_span=1, column_span=1
 ).set_title("")
-object_pressure = trimesh.load(
-    "D:/Computer Aplication/WorkPlacement/Projects/Project19/Weekly dash/pressure.obj"
+object_pressure = get_lod_mesh(
+    "Weekly dash/pressure.obj", row_span=1, column_span=1, scale=0.7
 )
 chart_3d_pressure.get_default_x_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
@@ -512,13 +582,8 @@ chart_3d_pressure.get_default_z_axis().set_tick_strategy("Empty").set_interval(
     start=0, end=1, stop_axis_after=True
 )
 chart_3d_pressure.set_camera_location(0, 1, 5)
-vertices_pressure = object_pressure.vertices.flatten().tolist()
-indices_pressure = object_pressure.faces.flatten().tolist()
-normals_pressure = object_pressure.vertex_normals.flatten().tolist()
 model_pressure = chart_3d_pressure.add_mesh_model().set_color(lc.Color("yellow"))
-model_pressure.set_model_geometry(
-    vertices=vertices_pressure, indices=indices_pressure, normals=normals_pressure
-)
+upload_geometry(model_pressure, object_pressure, label="pressure icon")
 model_pressure.set_scale(0.7).set_model_location(1, 0.3, 0).set_model_rotation(
     90, 0, 30
 )
@@ -540,6 +605,9 @@ hourly_charts = []
 hourly_textboxes = []
 hourly_3d_charts = []
 hourly_3d_models = []
+# Per-slot state so geometry is only re-sent when the mapped OBJ changes
+hourly_model_assets = [None] * 6
+hourly_model_visible = [False] * 6
 for i in range(6):
     chart = dashboard.ChartXY(
         row_index=8, column_index=6 + i, row_span=1, column_span=1
@@ -657,14 +725,21 @@ for i in range(6):
 
 
 # ─── Update Function for Next 6 Hours Forecast (and alerts) ───────
-def update_next_6_hours(weather_df, current_time):
+@metrics.timed("update_next_6_hours")
+def update_next_6_hours(weather, current_time):
     print("🔍 Debugging: Current Time:", current_time.strftime("%Y-%m-%d %H:%M"))
     # Use current_time (without adding an extra hour) as the lower bound.
-    next_hours = weather_df.loc[weather_df["Time"] >= current_time].head(6)
-    if next_hours.empty:
-        print("⚠️ Warning: No future data available in weather_df!")
+    first = np.searchsorted(weather["time"], current_time.timestamp())
+    rows = range(first, min(first + 6, len(weather["time"])))
+    if not rows:
+        print("⚠️ Warning: No future data available in weather data!")
         return
-    next_times = list(next_hours["Time"])
+    next_times = [
+        datetime.fromtimestamp(int(weather["time"][row]), local_tz) for row in rows
+    ]
+    next_hours = [
+        {name: column[row] for name, column in weather.items()} for row in rows
+    ]
     while len(next_times) < 6:
         next_times.append(next_times[-1] + timedelta(hours=1))
     print("✅ Next 6 Hours:", [t.strftime("%H:%M") for t in next_times])
@@ -672,9 +747,9 @@ def update_next_6_hours(weather_df, current_time):
     for i, text_box in enumerate(hourly_textboxes):
         text_box.set_text(next_times[i].strftime("%H:%M"))
     # Update Alert, Temperature, Humidity, and Pressure text boxes
-    for i, forecast in enumerate(next_hours.to_dict("records")):
+    for i, forecast in enumerate(next_hours):
         # Check for missing data; if missing, set to "-"
-        if forecast.get("temperature_2m") is None:
+        if np.isnan(forecast.get("temperature_2m", np.nan)):
             hourly_alert_textboxes[i].set_text("-")
             hourly_temperature_textboxes[i].set_text("-")
             hourly_humidity_textboxes[i].set_text("-")
@@ -707,27 +782,40 @@ def update_next_6_hours(weather_df, current_time):
             pressure = forecast.get("pressure_msl", 0)
             pressure_text = f"{pressure:.1f} hPa"
             hourly_pressure_textboxes[i].set_text(pressure_text)
-    # Update 3D Weather Models
-    for i, forecast in enumerate(next_hours.to_dict("records")):
-        weather_code = forecast.get("weather_code", None)
+    # Update 3D Weather Models (geometry is re-uploaded only when a slot's OBJ
+    # changes; unchanged slots just have their visibility adjusted)
+    uploaded_bytes = 0
+    skipped_uploads = 0
+    for i, forecast in enumerate(next_hours):
+        weather_code = code_value(forecast.get("weather_code", MISSING_CODE))
         obj_file = weather_mapping.get(weather_code, None)
-        if obj_file:
-            vertices, indices, normals = load_mesh_model(obj_file)
-            if vertices:
-                hourly_3d_models[i].set_model_geometry(
-                    vertices=vertices, indices=indices, normals=normals
-                )
+        visible = False
+        if obj_file and obj_file == hourly_model_assets[i]:
+            skipped_uploads += 1
+            visible = True
+        elif obj_file:
+            mesh = load_mesh_model(obj_file)
+            if len(mesh.vertices):
+                upload_geometry(hourly_3d_models[i], mesh, label=obj_file)
+                hourly_model_assets[i] = obj_file
+                uploaded_bytes += geometry_nbytes(mesh)
+                visible = True
+        if visible != hourly_model_visible[i]:
+            if visible:
                 hourly_3d_models[i].set_model_location(0, 0, 0)
             else:
                 hourly_3d_models[i].set_model_location(8, 0, 0)
-        else:
-            hourly_3d_models[i].set_model_location(8, 0, 0)
+            hourly_model_visible[i] = visible
+    print(
+        f"📦 Hourly models: {uploaded_bytes} geometry bytes uploaded, "
+        f"{skipped_uploads} uploads skipped"
+    )
 
 
 # ─── Synchronized Forecast Generator ─────────────────────────────
 def forecast_generator():
-    weather_df = fetch_weather_data()
-    if weather_df.empty:
+    weather = fetch_weather_data()
+    if not len(weather["time"]):
         return
     # Compute forecast_start as the current hour (rounded down)
     forecast_start = datetime.now(local_tz).replace(minute=0, second=0, microsecond=0)
@@ -736,155 +824,215 @@ def forecast_generator():
     while current_time < datetime.now(local_tz).replace(
         minute=0, second=0, microsecond=0
     ):
-        update_next_6_hours(weather_df, current_time)
+        update_next_6_hours(weather, current_time)
         yield current_time
         current_time += timedelta(hours=1)
         time.sleep(1)  # sync delay (adjust as needed)
-    update_next_6_hours(weather_df, current_time)
+    update_next_6_hours(weather, current_time)
     yield current_time
 
 
 # ─── Open the Dashboard and Create the Forecast Generator ─────
 dashboard.open(live=True)
+# Long trend ranges are downsampled to the chart width; zooming in re-sends the
+# visible range at full resolution
+trend_resampler = ZoomResampler(
+    line_chart.get_default_x_axis(),
+    series_dict,
+    width_px=chart_width(line_chart),
+    fitter=trend_fitter,
+    lock=trend_lock,
+    source=stored_trends,
+).attach()
 forecast_gen = forecast_generator()
 
-# ─── Process Historical Weather Data, Stepping Forecast Updates Synchronously ─
-past_weather_df = fetch_past_weather()
-past_weather_df["Time"] = (
-    pd.to_datetime(past_weather_df["time"])
-    .dt.tz_localize("UTC")
-    .dt.tz_convert("Europe/Helsinki")
-)
-past_weather_df["Timestamp"] = past_weather_df["Time"].astype("int64") // 10**6
-print("Filtered past weather data:", past_weather_df)
-
-previous_obj = None
-previous_weather_code = None
+# ─── Fetch Startup Data Concurrently ─────────────────────────────
+# Past and forecast data are independent requests, so they run in parallel
+data_engine = DataEngine(fetch=history_fetch)
+data_engine.register("past", API_URL, PAST_PARAMS, parse=parse_past_weather)
+data_engine.register("forecast", API_URL, FORECAST_PARAMS, parse=parse_weather_data)
+startup_frames = data_engine.fetch_all_sync()
+if isinstance(startup_frames["past"], Exception):
+    raise startup_frames["past"]
+# Forecast data for historical playback
+historical_forecast = startup_frames["forecast"]
+if isinstance(historical_forecast, Exception):
+    print(f"Error fetching weather data: {historical_forecast}")
+    historical_forecast = decode_columns({})
+
+# ─── Historical Playback ─────────────────────────────────────────
+# Every frame is precomputed from the column arrays once; the engine then only
+# renders them.  WEATHER_PLAYBACK_SPEED sets the speed (1 = one hour of data
+# per second, "max" = as fast as possible).
+PLAYBACK_SPEED = os.environ.get("WEATHER_PLAYBACK_SPEED", "1")
+PLAYBACK_SPEED = FASTEST if PLAYBACK_SPEED == "max" else float(PLAYBACK_SPEED)
+
+
+def build_playback_frames(columns):
+    times = columns["time"]
+    wind_speed = columns["wind_speed_10m"]
+    wind_direction = columns["wind_direction_10m"]
+    # Polar heatmap cell of every row, computed for all rows at once
+    sector_index = ((wind_direction / 360) * sectors).astype(int) % sectors
+    annulus_index = np.minimum((wind_speed // 3).astype(int), annuli - 1)
+    soil_temp = np.column_stack(
+        [columns[name] for name in CURRENT_VARIABLES if "soil_temperature" in name]
+    ).tolist()
+    soil_moisture = np.column_stack(
+        [columns[name] for name in CURRENT_VARIABLES if "soil_moisture" in name]
+    ).tolist()
+    cloud_cover = np.column_stack([columns[name] for name in CLOUD_VARIABLES]).tolist()
+    frames = []
+    for i, t in enumerate(times.tolist()):
+        frame_time = datetime.fromtimestamp(t, local_tz)
+        frames.append(
+            {
+                "time": frame_time,
+                # Forecast start: the historical row's time rounded down to the hour
+                "forecast_start": frame_time.replace(minute=0, second=0, microsecond=0),
+                "timestamp": t * 1000,
+                "weather_code": code_value(columns["weather_code"][i]),
+                "temperature": float(columns["temperature_2m"][i]),
+                "wind_speed": float(wind_speed[i]),
+                "wind_cell": (int(annulus_index[i]), int(sector_index[i])),
+                "soil_temp": soil_temp[i],
+                "soil_moisture": soil_moisture[i],
+                "cloud_cover": cloud_cover[i],
+                "trends": {
+                    feature: float(columns[variable][i])
+                    for feature, variable in TREND_VARIABLES.items()
+                },
+            }
+        )
+    return times, frames
 
-# Fetch forecast data once for historical playback
-historical_forecast_df = fetch_weather_data()
-
-for _, row in past_weather_df.iterrows():
-    timestamp = row["Timestamp"]
-    weather_code = row["weather_code"]
-    wind_speed = row["wind_speed_10m"]
-    wind_direction = row["wind_direction_10m"]
-    percipitation = row["precipitation"]
-    temperature = row["temperature_2m"]
-    humidity = row["relative_humidity_2m"]
-    pressure = row["pressure_msl"]
-    soil_temp = [
-        row["soil_temperature_0_to_7cm"],
-        row["soil_temperature_7_to_28cm"],
-        row["soil_temperature_28_to_100cm"],
-        row["soil_temperature_100_to_255cm"],
-    ]
-    soil_moisture = [
-        row["soil_moisture_0_to_7cm"],
-        row["soil_moisture_7_to_28cm"],
-        row["soil_moisture_28_to_100cm"],
-        row["soil_moisture_100_to_255cm"],
-    ]
-    cloud_cover_dict = [
-        row["cloud_cover"],
-        row["cloud_cover_low"],
-        row["cloud_cover_mid"],
-        row["cloud_cover_high"],
-    ]
 
-    print(f"Historical Time: {row['Time']}")
-    print(f"Cloud Cover: {cloud_cover_dict}")
+def render_historical_frame(frame):
+    global previous_obj, previous_weather_code
+    print(f"Historical Time: {frame['time']}")
+    print(f"Cloud Cover: {frame['cloud_cover']}")
+    weather_code = frame["weather_code"]
     if weather_code != previous_weather_code:
         new_obj = weather_mapping.get(weather_code, None)
         transition_weather(previous_obj, new_obj)
         previous_obj = new_obj
         previous_weather_code = weather_code
         print(f"Updated weather object to: {new_obj}")
-    gauge_chart.set_value(temperature)
+    gauge_chart.set_value(frame["temperature"])
     intensity_values = [[0] * sectors for _ in range(annuli)]
-    sector_index = int((wind_direction / 360) * sectors) % sectors
-    annulus_index = min(int(wind_speed // 3), annuli - 1)
-    intensity_values[annulus_index][sector_index] += wind_speed
+    annulus_index, sector_index = frame["wind_cell"]
+    intensity_values[annulus_index][sector_index] += frame["wind_speed"]
     heatmap_series.invalidate_intensity_values(intensity_values)
     bar_chart_temp.set_data(
-        [{"category": soil_categories[i], "value": soil_temp[i]} for i in range(4)]
+        [
+            {"category": soil_categories[i], "value": frame["soil_temp"][i]}
+            for i in range(4)
+        ]
     )
     bar_chart_moisture.set_data(
         [
-            {"category": moisture_categories[i], "value": soil_moisture[i]}
+            {"category": moisture_categories[i], "value": frame["soil_moisture"][i]}
             for i in range(4)
         ]
     )
     bar_chart_cloud.set_data(
         [
-            {"category": cloud_categories[i], "value": cloud_cover_dict[i]}
+            {"category": cloud_categories[i], "value": frame["cloud_cover"][i]}
             for i in range(4)
         ]
     )
-    for feature, series in series_dict.items():
-        if feature == "Wind Speed (km/h)":
-            series.add([timestamp], [wind_speed])
-        elif feature == "Humidity (%)":
-            series.add([timestamp], [humidity])
-        elif feature == "Pressure (hPa)":
-            series.add([timestamp], [pressure])
-        elif feature == "Precipitation (mm)":
-            series.add([timestamp], [percipitation])
-
-    # For historical playback, update the forecast row based on the current historical row's time.
-    # Compute the forecast start as the historical row's time rounded down to the hour.
-    historical_time = row["Time"]
-    historical_forecast_start = historical_time.replace(
-        minute=0, second=0, microsecond=0
-    )
-    update_next_6_hours(historical_forecast_df, historical_forecast_start)
+    if not preload_trends:
+        with trend_lock:
+            trend_batcher.append_row(frame["timestamp"], frame["trends"])
+
+    # For historical playback, update the forecast row based on the frame's time.
+    update_next_6_hours(historical_forecast, frame["forecast_start"])
     print(
-        f"Forecast updated for historical time: {historical_forecast_start.strftime('%Y-%m-%d %H:%M:%S')}"
+        f"Forecast updated for historical time: {frame['forecast_start'].strftime('%Y-%m-%d %H:%M:%S')}"
     )
+    metrics.mark("first_paint", once=True)
+
+
+past_weather = startup_frames["past"]
+print(f"Filtered past weather data: {len(past_weather['time'])} hourly rows")
+
+previous_obj = None
+previous_weather_code = None
 
-    time.sleep(1)  # main loop delay
+# At full speed there is nothing to watch build up, so the trend chart gets the
+# whole range in one add() per series instead of one per frame
+preload_trends = PLAYBACK_SPEED == FASTEST
+if preload_trends:
+    with trend_lock:
+        for feature, variable in TREND_VARIABLES.items():
+            trend_batcher.load(
+                feature, past_weather["time"] * 1000, past_weather[variable]
+            )
+
+playback = PlaybackEngine(
+    *build_playback_frames(past_weather),
+    render=render_historical_frame,
+    speed=PLAYBACK_SPEED,
+)
+playback.play()
+with trend_lock:
+    trend_batcher.flush()
 
 
 print("Switching to real-time weather updates...")
 
+
 # ─── Real-Time Weather Updates ───────────────────────────────
-# ─── Real-Time Weather Updates ───────────────────────────────
-while True:
-    # Fetch current weather data from the "current" part
-    real_time_data = fetch_real_time_weather()
+# Fetching and parsing run on a worker thread; the widgets are updated from
+# the latest snapshot per topic by the render loop below.
+@metrics.timed("realtime_fetch")
+def fetch_realtime_snapshot():
+    # One merged request feeds the current values, cloud cover and forecast row
+    tick_data = realtime_planner.fetch()
     # Get the actual current time (with minutes and seconds)
     current = datetime.now(local_tz)
-    real_time_timestamp = int(current.timestamp() * 1000)
 
-    # Also fetch hourly forecast data (which contains cloud_cover fields)
-    rt_weather_df = fetch_weather_data()
+    # Hourly cloud_cover fields for today
+    clouds = decode_columns(tick_data["clouds"]["hourly"])
     # Find the forecast row corresponding to the current hour
     current_hour = current.replace(minute=0, second=0, microsecond=0)
-    current_row = rt_weather_df[rt_weather_df["Time"] == current_hour]
-    if current_row.empty:
-        # If no exact match is found, choose the closest (for example, the first row)
-        current_row = rt_weather_df.iloc[[0]]
+    matches = np.flatnonzero(clouds["time"] == int(current_hour.timestamp()))
+    # If no exact match is found, choose the closest (for example, the first row)
+    row = matches[0] if len(matches) else 0
     try:
-        cloud_cover = float(current_row.iloc[0]["cloud_cover"])
-        cloud_cover_low = float(current_row.iloc[0]["cloud_cover_low"])
-        cloud_cover_mid = float(current_row.iloc[0]["cloud_cover_mid"])
-        cloud_cover_high = float(current_row.iloc[0]["cloud_cover_high"])
+        cloud_cover = [
+            float(np.nan_to_num(clouds[name][row])) for name in CLOUD_VARIABLES
+        ]
     except Exception:
-        cloud_cover = cloud_cover_low = cloud_cover_mid = cloud_cover_high = 0
+        cloud_cover = [0, 0, 0, 0]
+
+    return {
+        "current": (current, tick_data["current"]["current"]),
+        "clouds": cloud_cover,
+        "next_hours": (current, decode_columns(tick_data["next_hours"]["hourly"])),
+    }
 
+
+@metrics.timed("realtime_apply")
+def apply_clouds(cloud_cover):
     # Update the cloud coverage bar chart using these values
     bar_chart_cloud.set_data(
-        [
-            {"category": "Total", "value": cloud_cover},
-            {"category": "Low", "value": cloud_cover_low},
-            {"category": "Mid", "value": cloud_cover_mid},
-            {"category": "High", "value": cloud_cover_high},
-        ]
+        [{"category": cloud_categories[i], "value": cloud_cover[i]} for i in range(4)]
     )
 
+
+@metrics.timed("realtime_apply")
+def apply_next_hours(snapshot):
     # Also update the forecast row continuously using interpolation
-    real_time_weather_df = fetch_weather_data()
-    update_next_6_hours(real_time_weather_df, current)
+    current, real_time_weather = snapshot
+    update_next_6_hours(real_time_weather, current)
+
+
+@metrics.timed("realtime_apply")
+def apply_current(snapshot):
+    global previous_obj, previous_weather_code
+    current, real_time_data = snapshot
+    real_time_timestamp = int(current.timestamp() * 1000)
 
     # Check for a change in weather code and update 3D model accordingly
     if real_time_data["weather_code"] != previous_weather_code:
@@ -921,17 +1069,16 @@ while True:
     heatmap_series.invalidate_intensity_values(intensity_values)
 
     # Update the multi-line charts with current data
-    series_dict["Wind Speed (km/h)"].add([real_time_timestamp], [wind_speed])
-    series_dict["Humidity (%)"].add(
-        [real_time_timestamp], [real_time_data["relative_humidity_2m"]]
-    )
-    series_dict["Pressure (hPa)"].add(
-        [real_time_timestamp], [real_time_data["pressure_msl"]]
-    )
-    series_dict["Precipitation (mm)"].add(
-        [real_time_timestamp], [real_time_data["precipitation"]]
-    )
-    line_chart.get_default_x_axis().fit()
+    with trend_lock:
+        trend_batcher.append_row(
+            real_time_timestamp,
+            {
+                feature: real_time_data[variable]
+                for feature, variable in TREND_VARIABLES.items()
+            },
+        )
+        trend_batcher.flush()
+        trend_fitter.fit()
 
     # Update soil data bar charts
     bar_chart_temp.set_data(
@@ -944,7 +1091,19 @@ while True:
         ]
     )
 
+    pipeline_stats = realtime_pipeline.metrics
     print(
         f"Real-Time Update at {current.strftime('%Y-%m-%d %H:%M:%S')} | Temp: {new_temperature}°C, Wind: {wind_speed} km/h"
+        f" | queue depth: {pipeline_stats['queue_depth']}, data age: {pipeline_stats['data_age']:.1f} s"
     )
-    time.sleep(30)  # Wait 30 seconds before the next update
+
+
+# WEATHER_REALTIME_INTERVAL shortens the fetch cadence (seconds), e.g. for benchmarks
+REALTIME_INTERVAL = float(os.environ.get("WEATHER_REALTIME_INTERVAL", 30))
+realtime_pipeline = RenderPipeline(
+    fetch_realtime_snapshot, fetch_interval=REALTIME_INTERVAL
+)
+realtime_pipeline.on("current", apply_current)
+realtime_pipeline.on("clouds", apply_clouds)
+realtime_pipeline.on("next_hours", apply_next_hours)
+realtime_pipeline.run_render_loop()
@@ -1,21 +1,32 @@
-import requests
 import lightningchart as lc
-import trimesh
-import collections
 from datetime import datetime
 import os
-import threading
-import time
+import pytz
+
+from mesh_cache import bundle_path, get_mesh
+from geometry import upload_geometry
+from weather_store import StoreBackedFetch
+from locations import current_location
+from weather_client import FORECAST_URL, get_json
+from poll_scheduler import UPDATE_DELAY, PollScheduler, next_update_time
+from data_engine import DataEngine
+from daily_aggregation import aggregate_daily
+from response_decoder import UNIXTIME_PARAMS, code_value, decode_columns
+import metrics
 
 with open(
     "D:/Computer Aplication/WorkPlacement/Projects/shared_variable.txt", "r"
 ) as f:
     mylicensekey = f.read().strip()
 lc.set_license(mylicensekey)
+# Stage timers and counters, exported when WEATHER_METRICS_PORT/_FILE is set
+metrics.start()
 
 # ====== Step 1: Fetch and Process Weather Data ======
-API_URL = "https://api.open-meteo.com/v1/forecast"
-LAT, LON = 60.1699, 24.9384
+API_URL = FORECAST_URL
+# Site shown by this process (WEATHER_LOCATION, default Helsinki)
+LOCATION = current_location()
+LAT, LON = LOCATION.latitude, LOCATION.longitude
 
 # Define API parameters to fetch **current and future days**
 API_PARAMS = {
@@ -24,46 +35,64 @@ API_PARAMS = {
     "hourly": "temperature_2m,weather_code,relative_humidity_2m,precipitation,rain,snowfall,pressure_msl,wind_direction_10m",
     "forecast_days": 7,
     "timezone": "auto",
+    **UNIXTIME_PARAMS,
 }
 
-# Fetch data
-response = requests.get(API_URL, params=API_PARAMS)
-response.raise_for_status()
-data = response.json()
-
-# Process hourly weather data
-hourly_data = data.get("hourly", {})
-timestamps = [datetime.strptime(t, "%Y-%m-%dT%H:%M") for t in hourly_data["time"]]
-weather_codes = hourly_data["weather_code"]
-temperatures = hourly_data["temperature_2m"]
-wind_directions = hourly_data["wind_direction_10m"]
-
-# Group by day
-weather_by_day = collections.defaultdict(list)
-temp_by_day = collections.defaultdict(list)
-wind_by_day = collections.defaultdict(list)
-
-for i, timestamp in enumerate(timestamps):
-    day_str = timestamp.strftime("%Y-%m-%d")
-    weather_by_day[day_str].append(weather_codes[i])
-    temp_by_day[day_str].append(temperatures[i])
-    wind_by_day[day_str].append(wind_directions[i])
-
-# Compute the daily average wind direction
-wind_avg = {
-    day: sum(directions) / len(directions) for day, directions in wind_by_day.items()
+CURRENT_PARAMS = {
+    "latitude": LAT,
+    "longitude": LON,
+    "current": "temperature_2m",
+    "timezone": "auto",
+    **UNIXTIME_PARAMS,
 }
 
-
-# Compute the most frequent weather code and average temperature per day
-processed_data = []
-for day, codes in weather_by_day.items():
-    most_frequent_weather = max(set(codes), key=codes.count)  # Most repeated weather
-    avg_temp = sum(temp_by_day[day]) / len(temp_by_day[day])  # Average temperature
-    processed_data.append((day, most_frequent_weather, avg_temp))
-
-# Sort data chronologically
-processed_data.sort(key=lambda x: x[0])
+# Fetch the week and the current temperature concurrently (forecast hours are
+# always refreshed; the local store keeps the dashboard starting when the API
+# cannot be reached).  The poll scheduler aligns later current-temperature
+# calls to the upstream update cadence, so those bypass the response cache.
+data_engine = DataEngine()
+data_engine.register(
+    "week",
+    API_URL,
+    API_PARAMS,
+    fetch=StoreBackedFetch(pytz.timezone(LOCATION.timezone)),
+)
+data_engine.register("current", API_URL, CURRENT_PARAMS, fetch=get_json)
+startup_frames = data_engine.fetch_all_sync()
+if isinstance(startup_frames["week"], Exception):
+    raise startup_frames["week"]
+data = startup_frames["week"]
+
+# Process hourly weather data: one grouped pass computes every daily statistic
+hourly_data = decode_columns(data.get("hourly", {}))
+daily_days, daily = aggregate_daily(
+    hourly_data["time"],
+    hourly_data,
+    {
+        "weather_code": ("mode",),  # Most repeated weather
+        "temperature_2m": ("mean", "min", "max"),
+        "wind_direction_10m": ("circular_mean",),
+        "relative_humidity_2m": ("mean",),
+        "precipitation": ("sum",),
+        "pressure_msl": ("mean",),
+    },
+    utc_offset_seconds=data.get("utc_offset_seconds", 0),
+)
+daily_days = daily_days.tolist()  # Sorted chronologically
+
+# Compute the daily average wind direction (circular mean, so 350° and 10°
+# average to 0° rather than 180°)
+wind_avg = dict(zip(daily_days, daily["wind_direction_10m"]["circular_mean"].tolist()))
+
+# The most frequent weather code (None for days without one) and average
+# temperature per day
+processed_data = list(
+    zip(
+        daily_days,
+        [code_value(code) for code in daily["weather_code"]["mode"]],
+        daily["temperature_2m"]["mean"].tolist(),
+    )
+)
 
 # Extract **today's data** and **future data separately**
 today = datetime.utcnow().date()
@@ -139,7 +168,7 @@ chart = dashboard.ChartXY(row_index=0, column_index=0, column_span=2, row_span=2
 chart.set_title("").set_chart_background_image("Images/Stormclouds.jpg")
 # chart.set_background_color(lc.Color(255, 255, 255, 128))
 town_textbox = (
-    chart.add_textbox("Helsinki, Finland", 0.5, 0.8)
+    chart.add_textbox(LOCATION.label, 0.5, 0.8)
     .set_text_font(42, weight="bold")
     .set_stroke(thickness=0, color=lc.Color(0, 0, 0, 0))
 )
@@ -195,29 +224,25 @@ def load_mesh_model(file_name, is_arrow=False):
     # If loading the arrow, always use "arrow.obj"
     if is_arrow:
         obj_file = "arrow.obj"
+    elif file_name is None:
+        print("No weather code for this day; leaving its model empty")
+        return None
     else:
         obj_file = weather_mapping.get(file_name, "Overcast.obj")  # Default to Overcast
 
     obj_path = f"Dataset/{obj_file}"
 
-    if not os.path.exists(obj_path):
+    if not (os.path.exists(obj_path) or os.path.exists(bundle_path(obj_path))):
         print(f"Missing model file: {obj_path}")
-        return None, None, None
+        return None
 
     try:
-        scene = trimesh.load(obj_path)
-        mesh = (
-            scene.dump(concatenate=True) if isinstance(scene, trimesh.Scene) else scene
-        )
-        vertices, indices, normals = (
-            mesh.vertices.flatten().tolist(),
-            mesh.faces.flatten().tolist(),
-            mesh.vertex_normals.flatten().tolist(),
-        )
-        return vertices, indices, normals
+        # Shared cache: each OBJ is parsed only once and kept as typed arrays
+        mesh = get_mesh(obj_path)
+        return mesh if len(mesh.vertices) else None
     except Exception as e:
         print(f"Error loading {obj_file}: {e}")
-        return None, None, None
+        return None
 
 
 # **Today's Section (Spanning Two Columns)**
@@ -231,22 +256,20 @@ chart_3d.set_camera_location(0, 1, 5)
 chart_3d_list.append(chart_3d)
 
 # Load Model for Today's Weather
-vertices, indices, normals = load_mesh_model(weather_conditions[0])
-if vertices and indices and normals:
+mesh = load_mesh_model(weather_conditions[0])
+if mesh is not None:
     model = chart_3d.add_mesh_model()
-    model.set_model_geometry(vertices=vertices, indices=indices, normals=normals)
+    upload_geometry(model, mesh)
     model.set_scale(1).set_model_location(0, 0.45, 0)
     mesh_models[weather_conditions[0]] = model
 else:
     print(f"Failed to load model for today's weather: {weather_conditions[0]}")
 
-arrow_vertices, arrow_indices, arrow_normals = load_mesh_model("arrow", is_arrow=True)
+arrow_mesh = load_mesh_model("arrow", is_arrow=True)
 
-if arrow_vertices and arrow_indices and arrow_normals:
+if arrow_mesh is not None:
     arrow_model = chart_3d.add_mesh_model().set_color(lc.Color("yellow"))
-    arrow_model.set_model_geometry(
-        vertices=arrow_vertices, indices=arrow_indices, normals=arrow_normals
-    )
+    upload_geometry(arrow_model, arrow_mesh)
     arrow_model.set_scale(0.07)  # Slightly Smaller
     arrow_model.set_model_location(0, -0.65, 0)  # **Positioned Below Center**
 
@@ -267,23 +290,19 @@ for col in range(1, 7):
     chart_3d_list.append(chart_3d)
 
     # Load Model for Future Weather
-    vertices, indices, normals = load_mesh_model(weather_conditions[col])
-    if vertices and indices and normals:
+    mesh = load_mesh_model(weather_conditions[col])
+    if mesh is not None:
         model = chart_3d.add_mesh_model()
-        model.set_model_geometry(vertices=vertices, indices=indices, normals=normals)
+        upload_geometry(model, mesh)
         model.set_scale(1).set_model_location(0, 0.45, 0)
         mesh_models[weather_conditions[col]] = model
     else:
         print(f"Failed to load model for day {col + 1}: {weather_conditions[col]}")
 
-    arrow_vertices, arrow_indices, arrow_normals = load_mesh_model(
-        "arrow", is_arrow=True
-    )
-    if arrow_vertices and arrow_indices and arrow_normals:
+    arrow_mesh = load_mesh_model("arrow", is_arrow=True)
+    if arrow_mesh is not None:
         arrow_model = chart_3d.add_mesh_model().set_color(lc.Color("yellow"))
-        arrow_model.set_model_geometry(
-            vertices=arrow_vertices, indices=arrow_indices, normals=arrow_normals
-        )
+        upload_geometry(arrow_model, arrow_mesh)
         arrow_model.set_scale(0.07)  # Slightly Smaller
         arrow_model.set_model_location(0, -0.65, 0)  # **Positioned Below Center**
 
@@ -303,8 +322,9 @@ chart_temp_today = dashboard.ChartXY(
 ).set_title("Temperature Overview")
 
 # **Extract Min and Max Temperatures from Today's Forecast**
-today_temps = temp_by_day[dates[0]]
-min_temp, max_temp = min(today_temps), max(today_temps)
+today_index = daily_days.index(dates[0])
+min_temp = daily["temperature_2m"]["min"][today_index]
+max_temp = daily["temperature_2m"]["max"][today_index]
 
 # **Create Static High and Low Temperature Text Boxes**
 high_temp_text = (
@@ -356,23 +376,12 @@ chart_humidity = dashboard.ChartXY(
 )
 chart_humidity.set_title("Humidity Changes Over the Week")
 
-humidity_values = hourly_data["relative_humidity_2m"]
-
-# Group humidity by day (to take average per day)
-humidity_by_day = collections.defaultdict(list)
-
-for i, timestamp in enumerate(timestamps):
-    day_str = timestamp.strftime("%Y-%m-%d")
-    humidity_by_day[day_str].append(humidity_values[i])
-
-# Compute the daily average humidity
-humidity_daily_avg = [
-    sum(humidities) / len(humidities) for humidities in humidity_by_day.values()
-]
+# Daily average humidity
+humidity_daily_avg = daily["relative_humidity_2m"]["mean"].tolist()
 
 # Extract days of the week for the x-axis
 humidity_days_of_week = [
-    datetime.strptime(day, "%Y-%m-%d").strftime("%A") for day in humidity_by_day.keys()
+    datetime.strptime(day, "%Y-%m-%d").strftime("%A") for day in daily_days
 ]
 
 # Add Point Line Series for humidity
@@ -404,14 +413,8 @@ chart_precip = dashboard.BarChart(
 ).set_value_label_display_mode("hidden")
 chart_precip.set_title("Precipitation Forecast (mm)")
 
-precip_by_day = collections.defaultdict(list)
-
-for i, timestamp in enumerate(timestamps):
-    day_str = timestamp.strftime("%Y-%m-%d")
-    precip_by_day[day_str].append(hourly_data["precipitation"][i])
-
-# Compute daily total precipitation
-precip_daily_total = [sum(precip) for precip in precip_by_day.values()]
+# Daily total precipitation
+precip_daily_total = daily["precipitation"]["sum"].tolist()
 
 # Add data to Bar Chart
 chart_precip.set_data(
@@ -427,24 +430,11 @@ chart_pressure = dashboard.ChartXY(
 )
 chart_pressure.set_title("Air Pressure Forecast Trends (hPa)")
 
-# Process air pressure data
-pressure_values = hourly_data["pressure_msl"]
-
-pressure_by_day = collections.defaultdict(list)
-
-for i, timestamp in enumerate(timestamps):
-    day_str = timestamp.strftime("%Y-%m-%d")
-    pressure_by_day[day_str].append(pressure_values[i])
-
-# Compute the daily average air pressure
-pressure_daily_avg = [
-    sum(pressures) / len(pressures) for pressures in pressure_by_day.values()
-]
+# Daily average air pressure
+pressure_daily_avg = daily["pressure_msl"]["mean"].tolist()
 
 # Extract days of the week for the x-axis
-pressure_days_of_week = [
-    datetime.strptime(day, "%Y-%m-%d").strftime("%A") for day in humidity_by_day.keys()
-]
+pressure_days_of_week = humidity_days_of_week
 
 # Add Point Line Series for air pressure
 pressure_series = chart_pressure.add_point_line_series()
@@ -471,31 +461,31 @@ for i, label in enumerate(pressure_days_of_week):
 
 
 ######**Function to Fetch Real-Time Temperature**
-def update_real_time_temperature():
-    while True:
-        try:
-            real_time_response = requests.get(
-                API_URL,
-                params={
-                    "latitude": LAT,
-                    "longitude": LON,
-                    "current": "temperature_2m",
-                    "timezone": "auto",
-                },
-            )
-            real_time_response.raise_for_status()
-            real_time_data = real_time_response.json()
-
-            if "current" in real_time_data:
-                real_temp = real_time_data["current"]["temperature_2m"]
-                current_temp_text.set_text(f"Current: {real_temp:.1f}°C")
-                print(f"Real-time temperature: {real_temp:.1f}°C, date: {dates[0]}")
-
-        except Exception as e:
-            print(f"Real-time temperature update failed: {e}")
-
-        time.sleep(0.1)
+def fetch_real_time_temperature():
+    return get_json(API_URL, CURRENT_PARAMS)
+
+
+def update_real_time_temperature(real_time_data):
+    if "current" in real_time_data:
+        real_temp = real_time_data["current"]["temperature_2m"]
+        current_temp_text.set_text(f"Current: {real_temp:.1f}°C")
+        print(f"Real-time temperature: {real_temp:.1f}°C, date: {dates[0]}")
 
 
 dashboard.open(live=True)
-threading.Thread(target=update_real_time_temperature, daemon=True).start()
+metrics.mark("first_paint")
+# The startup fetch already has the current temperature; the first poll then
+# waits for the next upstream update
+startup_current = startup_frames["current"]
+first_poll = None
+if not isinstance(startup_current, Exception):
+    update_real_time_temperature(startup_current)
+    first_poll = next_update_time(startup_current) + UPDATE_DELAY
+poll_scheduler = PollScheduler()
+poll_scheduler.register(
+    "current_temperature",
+    fetch_real_time_temperature,
+    update_real_time_temperature,
+    first_due=first_poll,
+)
+poll_scheduler.start()
@@ -0,0 +1,83 @@
+import lightningchart as lc
+from datetime import datetime, timezone
+import os
+
+from grid_field import fetch_grid, grid_points, heatmap_frames
+from locations import current_location
+from playback import PlaybackEngine
+from weather_client import FORECAST_URL
+import palettes
+import metrics
+
+with open(
+    "D:/Computer Aplication/WorkPlacement/Projects/shared_variable.txt", "r"
+) as f:
+    mylicensekey = f.read().strip()
+lc.set_license(mylicensekey)
+# Stage timers and counters, exported when WEATHER_METRICS_PORT/_FILE is set
+metrics.start()
+
+# ─── Regional Mode: Gridded Field as a Heatmap ────────────────────
+# Samples a lat/lon box around the current site (or WEATHER_REGION, given as
+# "south,west,north,east") every WEATHER_GRID_STEP degrees, fetches the whole
+# grid in batched multi-coordinate requests and animates the hourly frames of
+# WEATHER_GRID_VARIABLE.  Frames are precomputed once; animating only swaps them.
+API_URL = FORECAST_URL
+LOCATION = current_location()
+if os.environ.get("WEATHER_REGION"):
+    SOUTH, WEST, NORTH, EAST = map(float, os.environ["WEATHER_REGION"].split(","))
+else:
+    SOUTH, NORTH = LOCATION.latitude - 2, LOCATION.latitude + 2
+    WEST, EAST = LOCATION.longitude - 4, LOCATION.longitude + 4
+GRID_STEP = float(os.environ.get("WEATHER_GRID_STEP", 0.25))
+VARIABLE = os.environ.get("WEATHER_GRID_VARIABLE", "temperature_2m")
+FORECAST_DAYS = 2
+HOUR_SECONDS = 0.5  # display time per hour of the animation
+
+latitudes, longitudes = grid_points(SOUTH, WEST, NORTH, EAST, GRID_STEP)
+print(f"Fetching {len(latitudes) * len(longitudes)} grid points for {VARIABLE}...")
+grid = fetch_grid(
+    API_URL, latitudes, longitudes, [VARIABLE], forecast_days=FORECAST_DAYS
+)
+frames = heatmap_frames(grid.fields[VARIABLE])
+print(f"Prepared {len(frames)} hourly frames")
+
+# ─── Heatmap Chart ────────────────────────────────────────────────
+chart = lc.ChartXY(theme=lc.Themes.CyberSpace, title=VARIABLE)
+heatmap = chart.add_heatmap_grid_series(
+    columns=len(longitudes), rows=len(latitudes), data_order="columns"
+)
+heatmap.set_start(x=float(longitudes[0]), y=float(latitudes[0]))
+heatmap.set_end(x=float(longitudes[-1]), y=float(latitudes[-1]))
+heatmap.set_intensity_interpolation(True)
+heatmap.set_palette_coloring(
+    steps=palettes.palette_steps(
+        palettes.VARIABLE_PALETTES.get(VARIABLE, palettes.TEMPERATURE)
+    ),
+    look_up_property="value",
+    interpolate=True,
+)
+chart.get_default_x_axis().set_title("Longitude (°)")
+chart.get_default_y_axis().set_title("Latitude (°)")
+chart.add_legend().add(heatmap)
+chart.open(live=True)
+
+
+def render_hour(frame):
+    hour, values = frame
+    heatmap.invalidate_intensity_values(values)
+    chart.set_title(
+        f"{LOCATION.label} region: {VARIABLE} at "
+        f"{datetime.fromtimestamp(hour, timezone.utc):%Y-%m-%d %H:%M} UTC"
+    )
+
+
+hours = grid.times.tolist()
+playback = PlaybackEngine(
+    hours,
+    list(zip(hours, frames)),
+    render=render_hour,
+    speed=1.0 / HOUR_SECONDS,
+    loop=True,
+)
+playback.play()
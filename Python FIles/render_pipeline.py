@@ -0,0 +1,122 @@
+import threading
+import time
+
+import metrics
+
+# ─── Fetch / Render Pipeline ──────────────────────────────────────
+# A fetch worker thread produces parsed snapshots per topic ("current",
+# "clouds", ...) and a render loop applies them to the widgets at its own
+# cadence.  The queue between them keeps only the latest snapshot per topic,
+# so a slow render never works through a backlog of outdated updates and a
+# slow fetch never holds up rendering.
+
+FETCH_INTERVAL = 30.0
+RENDER_INTERVAL = 0.5
+
+
+class LatestValueQueue:
+    """Bounded queue that coalesces pending items by topic."""
+
+    def __init__(self, max_topics=16):
+        self.max_topics = max_topics
+        self._items = {}  # topic -> (value, produced_at)
+        self._lock = threading.Lock()
+        self.coalesced = 0
+        self.dropped = 0
+
+    def put(self, topic, value, produced_at=None):
+        produced_at = time.time() if produced_at is None else produced_at
+        with self._lock:
+            if topic in self._items:
+                self.coalesced += 1
+                del self._items[topic]
+            elif len(self._items) >= self.max_topics:
+                # Drop the topic that has been waiting longest
+                del self._items[next(iter(self._items))]
+                self.dropped += 1
+            self._items[topic] = (value, produced_at)
+
+    def drain(self):
+        """Remove and return {topic: (value, produced_at)} of pending items."""
+        with self._lock:
+            items, self._items = self._items, {}
+        return items
+
+    def depth(self):
+        with self._lock:
+            return len(self._items)
+
+
+class RenderPipeline:
+    def __init__(
+        self, produce, fetch_interval=FETCH_INTERVAL, render_interval=RENDER_INTERVAL
+    ):
+        """`produce()` returns {topic: snapshot}; it runs on the fetch worker."""
+        self.produce = produce
+        self.fetch_interval = fetch_interval
+        self.render_interval = render_interval
+        self.queue = LatestValueQueue()
+        self.appliers = {}
+        self.metrics = {
+            "fetches": 0,
+            "fetch_errors": 0,
+            "applied": 0,
+            "queue_depth": 0,
+            "coalesced": 0,
+            "data_age": 0.0,
+            "max_data_age": 0.0,
+        }
+        self._thread = None
+
+    def on(self, topic, apply):
+        """Register `apply(snapshot)` to run on the render loop for `topic`."""
+        self.appliers[topic] = apply
+        return self
+
+    def _fetch_worker(self):
+        while True:
+            started = time.time()
+            try:
+                for topic, snapshot in self.produce().items():
+                    self.queue.put(topic, snapshot, produced_at=started)
+                self.metrics["fetches"] += 1
+            except Exception as e:
+                self.metrics["fetch_errors"] += 1
+                print(f"Fetch worker failed: {e}")
+            time.sleep(max(0.0, self.fetch_interval - (time.time() - started)))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._fetch_worker, daemon=True)
+            self._thread.start()
+        return self
+
+    def render_once(self):
+        """Apply all pending snapshots; returns the number applied."""
+        self.metrics["queue_depth"] = self.queue.depth()
+        self.metrics["coalesced"] = self.queue.coalesced
+        pending = self.queue.drain()
+        for topic, (snapshot, produced_at) in pending.items():
+            apply = self.appliers.get(topic)
+            if apply is None:
+                continue
+            try:
+                with metrics.timer("widget_update"):
+                    apply(snapshot)
+            except Exception as e:
+                print(f"Render of {topic} failed: {e}")
+                metrics.count("widget_update_errors_total")
+                continue
+            age = time.time() - produced_at
+            self.metrics["applied"] += 1
+            self.metrics["data_age"] = age
+            self.metrics["max_data_age"] = max(self.metrics["max_data_age"], age)
+        return len(pending)
+
+    def run_render_loop(self):
+        """Block the calling thread, rendering at `render_interval`."""
+        self.start()
+        while True:
+            started = time.time()
+            self.render_once()
+            time.sleep(max(0.0, self.render_interval - (time.time() - started)))
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+import time
+
+import metrics
+from weather_client import get_json, recording, request_key
+
+# ─── Open-Meteo Response Cache ────────────────────────────────────
+# Open-Meteo refreshes "current" values every 15 minutes and hourly model data
+# roughly once an hour, so polling faster than that only re-downloads the
+# same payload.  Responses are cached per canonicalized request, expire after
+# the TTL of the fastest-updating field group they contain, and are served
+# stale while a background refresh runs.  The cache survives restarts; entries
+# past TTL + MAX_STALE are dropped and at most MAX_ENTRIES (the most recently
+# fetched) are kept.
+
+# Seconds until a response is refreshed, per requested field group
+TTL_BY_GROUP = {
+    "current": 15 * 60,
+    "minutely_15": 15 * 60,
+    "hourly": 60 * 60,
+    "daily": 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+# Stale responses older than TTL + this are refetched before returning
+MAX_STALE = 6 * 60 * 60
+MAX_ENTRIES = 256
+CACHE_PATH = ".cache/open_meteo_responses.json"
+
+_lock = threading.Lock()
+_save_lock = threading.Lock()  # serializes file writes, taken without _lock
+_entries = None  # key string -> {"fetched_at", "expires_at": epoch s, "payload"}
+_version = 0  # bumped on every change; a write only lands if it is newer
+_saved_version = 0
+_refreshing = set()
+
+cache_stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+
+
+def ttl_for(params):
+    ttls = [ttl for group, ttl in TTL_BY_GROUP.items() if params.get(group)]
+    return min(ttls) if ttls else DEFAULT_TTL
+
+
+def _key_string(url, params):
+    return json.dumps(request_key(url, params))
+
+
+def _expires_at(entry):
+    return entry.get("expires_at", entry["fetched_at"] + DEFAULT_TTL + MAX_STALE)
+
+
+def _prune(now):
+    """Drop expired entries and the oldest ones beyond MAX_ENTRIES (under _lock)."""
+    for key in [k for k, entry in _entries.items() if _expires_at(entry) <= now]:
+        del _entries[key]
+    if len(_entries) > MAX_ENTRIES:
+        by_age = sorted(_entries, key=lambda k: _entries[k]["fetched_at"])
+        for key in by_age[: len(_entries) - MAX_ENTRIES]:
+            del _entries[key]
+
+
+def _load():
+    global _entries
+    if _entries is not None:
+        return
+    _entries = {}
+    try:
+        with open(CACHE_PATH, "r") as f:
+            _entries = json.load(f)
+    except (OSError, ValueError):
+        pass
+    _prune(time.time())
+
+
+def _save():
+    """Write the current entries to CACHE_PATH; call without holding _lock."""
+    global _saved_version
+    with _save_lock:
+        with _lock:
+            if _version <= _saved_version:
+                return  # a newer snapshot was written meanwhile
+            version, snapshot = _version, dict(_entries)
+        os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
+        tmp_path = CACHE_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, CACHE_PATH)
+        _saved_version = version
+
+
+def _store(key, payload, ttl):
+    global _version
+    now = time.time()
+    with _lock:
+        _entries[key] = {
+            "fetched_at": now,
+            "expires_at": now + ttl + MAX_STALE,
+            "payload": payload,
+        }
+        _prune(now)
+        _version += 1
+    try:
+        _save()
+    except OSError as e:
+        print(f"Could not persist response cache: {e}")
+
+
+def _refresh(url, params, key, ttl):
+    try:
+        _store(key, get_json(url, params), ttl)
+        with _lock:
+            cache_stats["refreshes"] += 1
+    except Exception as e:
+        print(f"Background refresh failed: {e}")
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+
+def cached_get_json(url, params, ttl=None):
+    """get_json with a TTL and stale-while-revalidate cache in front of it."""
+    if recording():
+        return get_json(url, params)
+    if ttl is None:
+        ttl = ttl_for(params)
+    key = _key_string(url, params)
+    with _lock:
+        _load()
+        entry = _entries.get(key)
+        age = time.time() - entry["fetched_at"] if entry else None
+        if entry and age < ttl:
+            cache_stats["hits"] += 1
+            metrics.count("response_cache_total", result="hit")
+            return entry["payload"]
+        if entry and age < ttl + MAX_STALE:
+            cache_stats["stale_hits"] += 1
+            metrics.count("response_cache_total", result="stale_hit")
+            if key not in _refreshing:
+                _refreshing.add(key)
+                threading.Thread(
+                    target=_refresh, args=(url, params, key, ttl), daemon=True
+                ).start()
+            return entry["payload"]
+        cache_stats["misses"] += 1
+    metrics.count("response_cache_total", result="miss")
+
+    payload = get_json(url, params)
+    _store(key, payload, ttl)
+    return payload
+
+
+def clear_response_cache():
+    global _entries
+    with _lock:
+        _entries = {}
+        try:
+            os.remove(CACHE_PATH)
+        except OSError:
+            pass
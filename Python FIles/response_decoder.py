@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+
+import metrics
+
+try:
+    import orjson
+except ImportError:  # optional, the standard library parser works too
+    orjson = None
+
+# ─── Typed Columnar Decoding of Open-Meteo Responses ──────────────
+# Requests add UNIXTIME_PARAMS so timestamps arrive as epoch seconds (UTC)
+# instead of ISO strings, and every hourly/daily block is decoded straight
+# into typed NumPy columns: int64 time, uint8 weather codes and float32
+# measurements (missing values become NaN, or MISSING_CODE for codes).
+
+UNIXTIME_PARAMS = {"timeformat": "unixtime"}
+CODE_VARIABLES = {"weather_code"}
+MISSING_CODE = 255
+
+
+@metrics.timed("json_parse")
+def loads(data):
+    """Parse a JSON body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@metrics.timed("decode")
+def decode_columns(block):
+    """Turn an Open-Meteo hourly/daily block into {variable: ndarray}."""
+    columns = {"time": np.asarray(block.get("time", []), dtype=np.int64)}
+    for variable, values in block.items():
+        if variable == "time":
+            continue
+        column = np.asarray(values, dtype=np.float32)  # None -> NaN
+        if variable in CODE_VARIABLES:
+            column = np.where(np.isnan(column), MISSING_CODE, column).astype(np.uint8)
+        columns[variable] = column
+    return columns
+
+
+def code_value(code):
+    """Python int for a decoded weather code, or None when it was missing."""
+    code = int(code)
+    return None if code == MISSING_CODE else code
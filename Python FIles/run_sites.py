@@ -0,0 +1,90 @@
+import argparse
+import multiprocessing
+import os
+import runpy
+import sys
+
+from backfill import HOURLY_VARIABLES
+from locations import LOCATIONS, fetch_batched
+from response_decoder import UNIXTIME_PARAMS, decode_columns
+from weather_client import FORECAST_URL, get_json
+from weather_store import WeatherStore, location_key
+
+# ─── Run Dashboards for Many Sites ────────────────────────────────
+# Starts one dashboard per registered site, each in a worker process from a
+# pool (run from the project root):
+#     python "Python FIles/run_sites.py" helsinki tampere oulu
+# Before the workers start, the hourly data every site needs at startup is
+# fetched with one multi-coordinate request per batch of sites and written to
+# the shared local store, so the dashboards start from the store instead of
+# each downloading it again.
+
+API_URL = FORECAST_URL
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCRIPT = "real_time_bars.py"
+# Covers the real-time dashboard's past day and the weekly forecast
+PREFETCH_PAST_DAYS = 1
+PREFETCH_FORECAST_DAYS = 7
+
+
+def prefetch(sites, store=None):
+    store = store or WeatherStore()
+    params_list = [
+        {
+            "latitude": site.latitude,
+            "longitude": site.longitude,
+            "hourly": ",".join(HOURLY_VARIABLES),
+            "past_days": PREFETCH_PAST_DAYS,
+            "forecast_days": PREFETCH_FORECAST_DAYS,
+            "timezone": "auto",
+            **UNIXTIME_PARAMS,
+        }
+        for site in sites
+    ]
+    # Not through the response cache: the store stamps what it writes as
+    # fetched now, so a cached payload would pass for fresh data
+    payloads = fetch_batched(API_URL, params_list, fetch=get_json)
+    for site, payload in zip(sites, payloads):
+        store.write(
+            location_key(site.latitude, site.longitude),
+            decode_columns(payload.get("hourly", {})),
+        )
+    print(f"Prefetched startup data for {len(sites)} sites")
+
+
+def run_site(script, name):
+    """Worker: run one dashboard script for the site `name`."""
+    os.environ["WEATHER_LOCATION"] = name
+    sys.path.insert(0, SCRIPT_DIR)
+    runpy.run_path(os.path.join(SCRIPT_DIR, script), run_name="__main__")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one dashboard per site")
+    parser.add_argument("sites", nargs="*", help="registered site names (default: all)")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT)
+    parser.add_argument(
+        "--processes", type=int, default=None, help="default and minimum: one per site"
+    )
+    parser.add_argument("--no-prefetch", action="store_true")
+    args = parser.parse_args()
+
+    names = args.sites or sorted(LOCATIONS)
+    sites = [LOCATIONS[name] for name in names]
+    # Every dashboard runs until it is closed, so a pool smaller than the site
+    # list would never start the remaining sites
+    if args.processes is not None and args.processes < len(sites):
+        parser.error(f"--processes must be at least {len(sites)}, one per site")
+    if not args.no_prefetch:
+        try:
+            prefetch(sites)
+        except Exception as e:
+            print(f"Prefetch failed, dashboards will fetch their own data: {e}")
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=args.processes or len(sites)) as pool:
+        results = [pool.apply_async(run_site, (args.script, name)) for name in names]
+        for name, result in zip(names, results):
+            try:
+                result.get()
+            except Exception as e:
+                print(f"Dashboard for {name} failed: {e}")
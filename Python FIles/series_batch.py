@@ -0,0 +1,62 @@
+import threading
+import time
+
+# ─── Batched Line Series Ingestion ────────────────────────────────
+# Every series.add() is a round trip to the chart, so points are buffered per
+# series and sent in one add() per series when the flush interval has passed
+# or a buffer reaches FLUSH_POINTS.  load() sends a whole range at once.
+
+FLUSH_INTERVAL = 1.0  # seconds
+FLUSH_POINTS = 500
+
+
+class SeriesBatcher:
+    def __init__(
+        self, series_by_name, flush_interval=FLUSH_INTERVAL, flush_points=FLUSH_POINTS
+    ):
+        self.series_by_name = series_by_name
+        self.flush_interval = flush_interval
+        self.flush_points = flush_points
+        self._pending = {name: ([], []) for name in series_by_name}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.add_calls = 0
+        self.points_sent = 0
+
+    def _send(self, name, xs, ys):
+        self.series_by_name[name].add(xs, ys)
+        self.add_calls += 1
+        self.points_sent += len(xs)
+
+    def append(self, name, x, y):
+        """Buffer one point; flushes when the batch is due."""
+        with self._lock:
+            xs, ys = self._pending[name]
+            xs.append(x)
+            ys.append(y)
+            full = len(xs) >= self.flush_points
+        if full or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def append_row(self, x, values):
+        """Buffer the same x for several series: values is {name: y}."""
+        for name, y in values.items():
+            self.append(name, x, y)
+
+    def flush(self):
+        """Send every buffered point; returns the number of add() calls."""
+        with self._lock:
+            pending = {name: batch for name, batch in self._pending.items() if batch[0]}
+            self._pending = {name: ([], []) for name in self.series_by_name}
+            self._last_flush = time.monotonic()
+        for name, (xs, ys) in pending.items():
+            self._send(name, xs, ys)
+        return len(pending)
+
+    def load(self, name, xs, ys):
+        """Bulk-load a whole range into one series with a single add()."""
+        self.flush()
+        xs = xs.tolist() if hasattr(xs, "tolist") else list(xs)
+        ys = ys.tolist() if hasattr(ys, "tolist") else list(ys)
+        if xs:
+            self._send(name, xs, ys)
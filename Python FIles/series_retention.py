@@ -0,0 +1,164 @@
+import numpy as np
+
+from downsample import downsample
+
+# ─── Bounded Line Series History ──────────────────────────────────
+# RetainedSeries wraps a chart line series so it holds at most `max_points`
+# points and, optionally, only the last `span` x units.  The points are
+# mirrored in a fixed-size ring buffer: the chart's own sample limit drops the
+# oldest points by count, and points older than the span are dropped from the
+# chart in amortized batches.  WindowFitter sets the axes to the retained
+# window only, instead of fit() over everything the chart has ever seen.
+# With `display_points` set, ranges longer than that are downsampled before
+# they reach the chart while the ring buffer keeps full resolution.
+
+RETENTION_POINTS = 4096
+# Fraction of the window that may be out of span before the chart is trimmed
+TRIM_SLACK = 0.1
+
+
+class RingBuffer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, xs, ys):
+        xs = np.asarray(xs, dtype=float)[-self.capacity :]
+        ys = np.asarray(ys, dtype=float)[-self.capacity :]
+        slots = (self.start + self.size + np.arange(len(xs))) % self.capacity
+        self.x[slots] = xs
+        self.y[slots] = ys
+        overflow = max(0, self.size + len(xs) - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.size = min(self.capacity, self.size + len(xs))
+
+    def drop_oldest(self, count):
+        count = min(count, self.size)
+        self.start = (self.start + count) % self.capacity
+        self.size -= count
+
+    def view(self):
+        """(x, y) in insertion order, oldest first."""
+        slots = (self.start + np.arange(self.size)) % self.capacity
+        return self.x[slots], self.y[slots]
+
+
+class RetainedSeries:
+    def __init__(self, series, max_points=RETENTION_POINTS, span=None):
+        """`series` must be fed in ascending x, as ProgressiveX series are."""
+        self.series = series
+        self.span = span
+        self.buffer = RingBuffer(max_points)
+        self.trims = 0
+        self.display_points = None
+        self.display_mode = "minmax"
+        # True while the chart holds every retained point at full resolution
+        self.complete = True
+        series.set_max_sample_count(max_points)
+
+    def add(self, xs, ys):
+        self.buffer.extend(xs, ys)
+        if self.display_points and len(xs) > self.display_points:
+            x, y = downsample(xs, ys, self.display_points, self.display_mode)
+            self.series.add(x.tolist(), y.tolist())
+            self.complete = False
+        else:
+            self.series.add(xs, ys)
+        if self.span is not None:
+            self._trim_to_span()
+        return self
+
+    def points(self, start=None, end=None):
+        """Full-resolution retained points with start <= x <= end."""
+        x, y = self.buffer.view()
+        first = 0 if start is None else np.searchsorted(x, start)
+        last = len(x) if end is None else np.searchsorted(x, end, side="right")
+        return x[first:last], y[first:last]
+
+    def redraw(self, x, y):
+        """Replace what the chart shows with (x, y), downsampled if needed."""
+        shown = len(x)
+        if self.display_points and len(x) > self.display_points:
+            x, y = downsample(x, y, self.display_points, self.display_mode)
+        self.series.clear()
+        self.series.add(x.tolist(), y.tolist())
+        self.complete = len(x) == shown == len(self.buffer)
+
+    def _trim_to_span(self):
+        x, y = self.buffer.view()
+        expired = int(np.searchsorted(x, x[-1] - self.span))
+        if expired <= TRIM_SLACK * len(x):
+            return
+        # The chart cannot drop points by x, so re-send the retained window
+        self.buffer.drop_oldest(expired)
+        self.redraw(x[expired:], y[expired:])
+        self.trims += 1
+
+    def window(self):
+        """(x_min, x_max, y_min, y_max) of the retained points, or None."""
+        if not len(self.buffer):
+            return None
+        x, y = self.buffer.view()
+        if self.span is not None:
+            x_min = max(x[0], x[-1] - self.span)
+            y = y[x >= x_min]
+        else:
+            x_min = x[0]
+        y = y[~np.isnan(y)]
+        if not len(y):
+            return x_min, x[-1], None, None
+        return x_min, x[-1], y.min(), y.max()
+
+
+class WindowFitter:
+    def __init__(self, x_axis, retained, y_axes=None, padding=0.05):
+        """`retained` and `y_axes` are {name: RetainedSeries} / {name: Axis}."""
+        self.x_axis = x_axis
+        self.retained = retained
+        self.y_axes = y_axes or {}
+        self.padding = padding
+        self._intervals = {}  # axis key -> last interval sent
+        # Interval events echo floats back; closer than this is the same
+        self.tolerance = 1e-6
+
+    def _set(self, key, axis, start, end):
+        start, end = float(start), float(end)
+        if self._intervals.get(key) == (start, end):
+            return
+        axis.set_interval(start, end, stop_axis_after=False)
+        self._intervals[key] = (start, end)
+
+    def is_fitted(self, start, end):
+        """Whether [start, end] is the x interval this fitter last set."""
+        fitted = self._intervals.get("x")
+        if fitted is None:
+            return False
+        slack = self.tolerance * max(fitted[1] - fitted[0], 1.0)
+        return abs(start - fitted[0]) <= slack and abs(end - fitted[1]) <= slack
+
+    def fit(self):
+        windows = {
+            name: window
+            for name, series in self.retained.items()
+            if (window := series.window()) is not None
+        }
+        if not windows:
+            return
+        self._set(
+            "x",
+            self.x_axis,
+            min(window[0] for window in windows.values()),
+            max(window[1] for window in windows.values()),
+        )
+        for name, (_, _, y_min, y_max) in windows.items():
+            axis = self.y_axes.get(name)
+            if axis is None or y_min is None:
+                continue
+            pad = (y_max - y_min) * self.padding or 1.0
+            self._set(name, axis, y_min - pad, y_max + pad)
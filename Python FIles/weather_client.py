@@ -0,0 +1,225 @@
+import collections
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from response_decoder import loads
+
+# ─── Shared HTTP Client for Open-Meteo ────────────────────────────
+# One keep-alive connection pool for every request the dashboards make, with
+# per-call timeouts, retries with exponential backoff and jitter, and a
+# circuit breaker that serves the last good payload while the API is down.
+
+# (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # seconds, doubled on every retry
+BACKOFF_MAX = 8.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Consecutive failed calls to one host before its breaker opens, and how long
+# it stays open.  Only connection errors, timeouts and RETRY_STATUS_CODES count;
+# a 400 for bad parameters says nothing about the host being down.
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 60.0
+# Last good payloads kept for serving stale, least recently used dropped first;
+# date-windowed requests would otherwise add a new key every day
+MAX_LAST_GOOD = 64
+
+
+# ─── Endpoints ────────────────────────────────────────────────────
+# OPEN_METEO_BASE_URL points every endpoint at one server, e.g. the local
+# fixture server (fixture_server.py); unset, the public Open-Meteo hosts are used.
+def set_base_url(base_url):
+    """Point the endpoints at `base_url` ("" for the public hosts).
+
+    Call it before importing modules that copy FORECAST_URL / ARCHIVE_URL.
+    """
+    global BASE_URL, FORECAST_URL, ARCHIVE_URL
+    BASE_URL = (base_url or "").rstrip("/")
+    FORECAST_URL = (BASE_URL or "https://api.open-meteo.com") + "/v1/forecast"
+    ARCHIVE_URL = (BASE_URL or "https://archive-api.open-meteo.com") + "/v1/archive"
+
+
+set_base_url(os.environ.get("OPEN_METEO_BASE_URL"))
+
+# With WEATHER_RECORD_DIR set, every successful response is saved there as a
+# fixture the fixture server can replay.  The response cache and the local
+# store are bypassed meanwhile, so a warm .cache cannot leave requests out.
+RECORD_DIR = os.environ.get("WEATHER_RECORD_DIR")
+
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
+_lock = threading.Lock()
+_last_good = collections.OrderedDict()  # request key -> last good payload
+_breakers = {}  # host -> {"failures": consecutive count, "open_until": monotonic}
+
+stats = {
+    "requests": 0,
+    "errors": 0,
+    "retries": 0,
+    "served_stale": 0,
+    "breaker_opens": 0,
+    "latency_total": 0.0,
+    "latency_max": 0.0,
+}
+
+
+def request_key(url, params):
+    """Canonical cache key for a request: URL plus sorted parameters."""
+    return (url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+
+
+def fixture_name(path, params):
+    """File name of the fixture for a request path and its parameters."""
+    key = json.dumps(request_key(path, params))
+    return hashlib.sha1(key.encode()).hexdigest()[:16] + ".json"
+
+
+def recording():
+    """Whether responses are being recorded as fixtures."""
+    return bool(RECORD_DIR)
+
+
+def _record(url, params, payload):
+    path = urlparse(url).path
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    fixture = {
+        "path": path,
+        "params": {str(k): str(v) for k, v in (params or {}).items()},
+        "recorded_at": int(time.time()),
+        "body": payload,
+    }
+    tmp_path = os.path.join(RECORD_DIR, fixture_name(path, params) + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(fixture, f)
+    os.replace(tmp_path, tmp_path[: -len(".tmp")])
+
+
+def _backoff_delay(attempt):
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt)
+    return random.uniform(0, delay)  # "full jitter"
+
+
+def _record_latency(elapsed):
+    metrics.observe("stage_seconds", elapsed, stage="fetch")
+    with _lock:
+        stats["requests"] += 1
+        stats["latency_total"] += elapsed
+        stats["latency_max"] = max(stats["latency_max"], elapsed)
+
+
+def _get_once(url, params, timeout):
+    started = time.perf_counter()
+    try:
+        response = session.get(url, params=params, timeout=timeout)
+    finally:
+        _record_latency(time.perf_counter() - started)
+    if response.status_code in RETRY_STATUS_CODES:
+        raise requests.exceptions.HTTPError(
+            f"{response.status_code} from {url}", response=response
+        )
+    response.raise_for_status()
+    payload = loads(response.content)
+    if RECORD_DIR:
+        _record(url, params, payload)
+    return payload
+
+
+def _is_retryable(error):
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in RETRY_STATUS_CODES
+    return isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    )
+
+
+def _serve_stale(key, error):
+    with _lock:
+        payload = _last_good.get(key)
+        if payload is not None:
+            _last_good.move_to_end(key)
+            stats["served_stale"] += 1
+    if payload is None:
+        raise error
+    metrics.count("fetch_served_stale_total")
+    print(f"Open-Meteo unavailable ({error}); serving last good response")
+    return payload
+
+
+def get_json(
+    url, params=None, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, keep_stale=True
+):
+    """GET `url` and return the decoded JSON body.
+
+    Raises requests.exceptions.RequestException when the request fails and no
+    earlier successful response for the same parameters is available.  With
+    `keep_stale` False the response is not kept for that (one-off requests).
+    """
+    key = request_key(url, params)
+    host = urlparse(url).netloc
+
+    with _lock:
+        breaker = _breakers.setdefault(host, {"failures": 0, "open_until": 0.0})
+        breaker_open = time.monotonic() < breaker["open_until"]
+    if breaker_open:
+        return _serve_stale(
+            key, requests.exceptions.ConnectionError("circuit breaker open")
+        )
+
+    attempt = 0
+    while True:
+        try:
+            payload = _get_once(url, params, timeout)
+            break
+        except (requests.exceptions.RequestException, ValueError) as e:
+            with _lock:
+                stats["errors"] += 1
+            metrics.count("fetch_errors_total")
+            retryable = _is_retryable(e)
+            if attempt < retries and retryable:
+                attempt += 1
+                with _lock:
+                    stats["retries"] += 1
+                metrics.count("fetch_retries_total")
+                time.sleep(_backoff_delay(attempt))
+                continue
+            with _lock:
+                if retryable:
+                    breaker["failures"] += 1
+                    if breaker["failures"] >= BREAKER_THRESHOLD:
+                        breaker["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+                        stats["breaker_opens"] += 1
+            if isinstance(e, ValueError):
+                e = requests.exceptions.RequestException(f"Invalid JSON from {url}")
+            return _serve_stale(key, e)
+
+    with _lock:
+        breaker["failures"] = 0
+        breaker["open_until"] = 0.0
+        if keep_stale:
+            _last_good[key] = payload
+            _last_good.move_to_end(key)
+            while len(_last_good) > MAX_LAST_GOOD:
+                _last_good.popitem(last=False)
+    return payload
+
+
+def client_stats():
+    with _lock:
+        result = dict(stats)
+    result["latency_avg"] = (
+        result["latency_total"] / result["requests"] if result["requests"] else 0.0
+    )
+    return result
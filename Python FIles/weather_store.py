@@ -0,0 +1,252 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import requests
+
+from response_decoder import (
+    CODE_VARIABLES,
+    MISSING_CODE,
+    UNIXTIME_PARAMS,
+    decode_columns,
+)
+from weather_client import get_json, recording
+
+# ─── Local Hourly Weather Store ───────────────────────────────────
+# SQLite table of hourly values keyed by (location, variable, unix time), so
+# history fetched once (e.g. by backfill.py) is read back locally instead of
+# being downloaded again.  Writes are upserts: newer values replace older ones.
+#
+# Every value also records when it was fetched.  An hour counts as settled once
+# it was fetched SETTLE_SECONDS after it happened; forecast hours and recent
+# analysis hours are still revisable and are fetched again unless they were
+# fetched in the last REFRESH_SECONDS.  StoreBackedFetch uses this to request
+# only the days with stale hours and serve the rest from disk, which also keeps
+# the dashboards starting while offline.
+
+STORE_PATH = os.path.join(".cache", "weather_history.sqlite")
+HOUR = 3600
+SETTLE_SECONDS = 24 * HOUR
+REFRESH_SECONDS = 15 * 60
+
+
+def location_key(latitude, longitude):
+    return f"{float(latitude):.4f},{float(longitude):.4f}"
+
+
+class WeatherStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        # Several dashboard processes may share one store
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS observations ("
+                " location TEXT NOT NULL,"
+                " variable TEXT NOT NULL,"
+                " time INTEGER NOT NULL,"
+                " value REAL,"
+                " fetched_at INTEGER NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (location, variable, time)"
+                ") WITHOUT ROWID"
+            )
+            columns = [
+                row[1] for row in self._db.execute("PRAGMA table_info(observations)")
+            ]
+            if "fetched_at" not in columns:
+                # Stores written before fetch times were tracked
+                self._db.execute(
+                    "ALTER TABLE observations"
+                    " ADD COLUMN fetched_at INTEGER NOT NULL DEFAULT 0"
+                )
+
+    def write(self, location, columns, fetched_at=None):
+        """Upsert decoded hourly columns ({"time": ..., variable: ...})."""
+        fetched_at = int(time.time() if fetched_at is None else fetched_at)
+        times = np.asarray(columns["time"], dtype=np.int64).tolist()
+        rows = []
+        for variable, values in columns.items():
+            if variable == "time":
+                continue
+            values = np.asarray(values, dtype=float)
+            if variable in CODE_VARIABLES:
+                values[values == MISSING_CODE] = np.nan
+            # NaN (missing) is stored as NULL
+            values = np.where(np.isnan(values), None, values).tolist()
+            rows.extend(
+                zip(
+                    [location] * len(times),
+                    [variable] * len(times),
+                    times,
+                    values,
+                    [fetched_at] * len(times),
+                )
+            )
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO observations"
+                " (location, variable, time, value, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def current_hours(self, location, variables, start, end):
+        """Hours in [start, end) held for every one of `variables`.
+
+        Only values that are settled or were fetched within REFRESH_SECONDS
+        count as held.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT time FROM observations"
+                " WHERE location = ? AND time >= ? AND time < ?"
+                f" AND variable IN ({','.join('?' * len(variables))})"
+                " AND (fetched_at - time >= ? OR fetched_at >= ?)"
+                " GROUP BY time HAVING COUNT(*) = ?",
+                (
+                    location,
+                    int(start),
+                    int(end),
+                    *variables,
+                    SETTLE_SECONDS,
+                    int(time.time()) - REFRESH_SECONDS,
+                    len(variables),
+                ),
+            ).fetchall()
+        return np.array([row[0] for row in rows], dtype=np.int64)
+
+    def read(self, location, variables, start=None, end=None):
+        """Stored hours in [start, end) as columns, typed like decode_columns.
+
+        Only hours held for at least one of `variables` are returned.
+        """
+        start = -(2**62) if start is None else int(start)
+        end = 2**62 if end is None else int(end)
+        series = {}
+        with self._lock:
+            for variable in variables:
+                # Rows come back in primary-key (time) order
+                rows = self._db.execute(
+                    "SELECT time, value FROM observations"
+                    " WHERE location = ? AND variable = ? AND time >= ? AND time < ?",
+                    (location, variable, start, end),
+                ).fetchall()
+                series[variable] = np.array(rows, dtype=float).reshape(-1, 2)
+        times = np.unique(
+            np.concatenate([rows[:, 0] for rows in series.values()] or [[]])
+        ).astype(np.int64)
+        columns = {"time": times}
+        for variable, rows in series.items():
+            column = np.full(len(times), np.nan, dtype=np.float32)
+            column[np.searchsorted(times, rows[:, 0])] = rows[:, 1]  # NULL -> NaN
+            if variable in CODE_VARIABLES:
+                column = np.where(np.isnan(column), MISSING_CODE, column).astype(
+                    np.uint8
+                )
+            columns[variable] = column
+        return columns
+
+    def close(self):
+        self._db.close()
+
+
+def local_midnight(day, tz):
+    """Unix time of 00:00 on `day` in `tz` (pytz or zoneinfo)."""
+    midnight = datetime(day.year, day.month, day.day)
+    if hasattr(tz, "localize"):
+        return int(tz.localize(midnight).timestamp())
+    return int(midnight.replace(tzinfo=tz).timestamp())
+
+
+class StoreBackedFetch:
+    def __init__(self, tz, store=None, fetch=get_json):
+        """Drop-in for cached_get_json(url, params) on hourly-only requests.
+
+        `tz` is the dashboard's local timezone, which decides what the
+        past_days / forecast_days of a request cover.  `fetch` must return
+        fresh payloads: values are stored as fetched now, so a cached response
+        would make old forecast hours look fresh (and settled).
+        """
+        self.tz = tz
+        self.store = store or WeatherStore()
+        self.fetch = fetch
+        self.hours_fetched = 0
+        self.hours_from_store = 0
+
+    def _day_runs(self, hours):
+        """Consecutive runs of local days containing `hours`, as (first, last)."""
+        days = sorted({datetime.fromtimestamp(int(t), self.tz).date() for t in hours})
+        runs = []
+        for day in days:
+            if runs and day == runs[-1][1] + timedelta(days=1):
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+        return runs
+
+    def __call__(self, url, params):
+        if "current" in params or "daily" in params:
+            raise ValueError("StoreBackedFetch only serves hourly requests")
+        variables = params["hourly"].split(",")
+        location = location_key(params["latitude"], params["longitude"])
+        today = datetime.now(self.tz).date()
+        start = local_midnight(
+            today - timedelta(days=params.get("past_days", 0)), self.tz
+        )
+        end = local_midnight(
+            today + timedelta(days=params.get("forecast_days", 7)), self.tz
+        )
+
+        expected = np.arange(start, end, HOUR)
+        # While recording, everything is fetched, as it is on a cold replay
+        held = (
+            np.array([], dtype=np.int64)
+            if recording()
+            else self.store.current_hours(location, variables, start, end)
+        )
+        missing = np.setdiff1d(expected, held)
+        base = {
+            key: value
+            for key, value in params.items()
+            if key not in ("past_days", "forecast_days")
+        }
+        error = None
+        for first, last in self._day_runs(missing):
+            try:
+                payload = self.fetch(
+                    url,
+                    {
+                        **base,
+                        **UNIXTIME_PARAMS,
+                        "start_date": first.isoformat(),
+                        "end_date": last.isoformat(),
+                    },
+                )
+            except requests.exceptions.RequestException as e:
+                error = e
+                continue
+            columns = decode_columns(payload.get("hourly", {}))
+            self.store.write(location, columns)
+            self.hours_fetched += len(columns["time"])
+        self.hours_from_store += len(expected) - len(missing)
+
+        columns = self.store.read(location, variables, start, end)
+        if error is not None:
+            if not len(columns["time"]):
+                raise error
+            print(f"Open-Meteo unavailable ({error}); serving stored history")
+        return {
+            "latitude": params["latitude"],
+            "longitude": params["longitude"],
+            "utc_offset_seconds": int(
+                datetime.now(self.tz).utcoffset().total_seconds()
+            ),
+            "hourly": columns,
+        }
@@ -0,0 +1,96 @@
+import collections
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python FIles")
+)
+from daily_aggregation import aggregate_daily  # noqa: E402
+
+# ─── Daily Aggregation Benchmark ──────────────────────────────────
+# Compares the old per-row grouping of real_time_forcasting.py (strftime per
+# row, max(set(codes), key=codes.count) per day) with the vectorized
+# aggregate_daily on synthetic hourly data.
+#     python benchmarks/bench_daily_aggregation.py [years ...]
+
+STATISTICS = {
+    "weather_code": ("mode",),
+    "temperature_2m": ("mean", "min", "max"),
+    "wind_direction_10m": ("circular_mean",),
+    "relative_humidity_2m": ("mean",),
+    "precipitation": ("sum",),
+    "pressure_msl": ("mean",),
+}
+
+
+def synthetic_hourly(hours, seed=0):
+    rng = np.random.default_rng(seed)
+    start = datetime(2020, 1, 1)
+    return {
+        "time": [
+            (start + timedelta(hours=h)).strftime("%Y-%m-%dT%H:%M")
+            for h in range(hours)
+        ],
+        "weather_code": rng.choice([0, 1, 2, 3, 45, 61, 63, 71, 95], hours).tolist(),
+        "temperature_2m": rng.normal(5, 10, hours).round(1).tolist(),
+        "wind_direction_10m": rng.uniform(0, 360, hours).round().tolist(),
+        "relative_humidity_2m": rng.uniform(30, 100, hours).round().tolist(),
+        "precipitation": rng.exponential(0.2, hours).round(1).tolist(),
+        "pressure_msl": rng.normal(1013, 8, hours).round(1).tolist(),
+    }
+
+
+def legacy_aggregate(hourly_data):
+    timestamps = [datetime.strptime(t, "%Y-%m-%dT%H:%M") for t in hourly_data["time"]]
+    by_day = {name: collections.defaultdict(list) for name in STATISTICS}
+    for name in STATISTICS:  # the dashboard walked the rows once per variable
+        for i, timestamp in enumerate(timestamps):
+            by_day[name][timestamp.strftime("%Y-%m-%d")].append(hourly_data[name][i])
+    result = {}
+    for day, codes in by_day["weather_code"].items():
+        temps = by_day["temperature_2m"][day]
+        result[day] = (
+            max(set(codes), key=codes.count),
+            sum(temps) / len(temps),
+            min(temps),
+            max(temps),
+            sum(by_day["wind_direction_10m"][day]) / 24,
+            sum(by_day["relative_humidity_2m"][day]) / 24,
+            sum(by_day["precipitation"][day]),
+            sum(by_day["pressure_msl"][day]) / 24,
+        )
+    return result
+
+
+def best_of(function, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(years_list=(0.02, 1, 5)):
+    results = []
+    for years in years_list:
+        hours = int(years * 365 * 24)
+        hourly_data = synthetic_hourly(hours)
+        legacy = best_of(lambda: legacy_aggregate(hourly_data))
+        vectorized = best_of(
+            lambda: aggregate_daily(hourly_data["time"], hourly_data, STATISTICS)
+        )
+        results.append({"hours": hours, "legacy_s": legacy, "vectorized_s": vectorized})
+        print(
+            f"{hours:>7} hours: legacy {legacy * 1000:9.1f} ms, "
+            f"vectorized {vectorized * 1000:7.1f} ms ({legacy / vectorized:5.1f}x)"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    run([float(a) for a in sys.argv[1:]] or (0.02, 1, 5))
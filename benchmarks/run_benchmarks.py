@@ -0,0 +1,331 @@
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SCRIPT_DIR = os.path.join(ROOT, "Python FIles")
+sys.path.insert(0, SCRIPT_DIR)
+from bench_daily_aggregation import STATISTICS, synthetic_hourly  # noqa: E402
+from daily_aggregation import aggregate_daily  # noqa: E402
+from fixture_server import FixtureServer, load_fixtures  # noqa: E402
+from mesh_cache import clear_cache, get_mesh, parse_obj  # noqa: E402
+from response_decoder import decode_columns, loads  # noqa: E402
+
+# ─── Benchmark Suite ──────────────────────────────────────────────
+# Runs offline against responses recorded with WEATHER_RECORD_DIR (see the
+# README) and writes every result to one JSON file (run from the project root):
+#     python benchmarks/run_benchmarks.py --fixtures fixtures
+#     python benchmarks/run_benchmarks.py --fixtures fixtures --compare OLD.json
+# In-process: mesh load per asset (OBJ parse, cold load_mesh_model, cached),
+# JSON-to-columns parse and the weekly dashboard's daily aggregation; these
+# fall back to synthetic payloads when no fixtures are recorded.
+# Dashboards: each script is started in a scratch directory (copied assets,
+# empty .cache) against the fixture server with WEATHER_BENCH_LOG set, so the
+# stage timers in Python FIles/metrics.py log their events there; cold
+# start runs to the first_paint mark, real_time_bars.py also runs TICKS
+# real-time ticks for update_next_6_hours and tick latency.  These need
+# LightningChart and its license and are listed as skipped otherwise.
+
+ASSET_DIRS = ["Dataset", "Weekly dash"]
+SCRIPTS = {"real_time_bars.py": True, "real_time_forcasting.py": False}  # -> ticks
+REPEAT = 5
+TICKS = 3
+TICK_INTERVAL = 2.0  # seconds, WEATHER_REALTIME_INTERVAL for the dashboard
+APPLIES_PER_TICK = 3  # topics a real-time snapshot updates
+SCRIPT_TIMEOUT = 120.0
+REGRESSION_THRESHOLD = 0.2  # relative slowdown of the median
+SYNTHETIC_START = 1577836800  # 2020-01-01 UTC
+
+
+def measure(function, repeat=REPEAT):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def result(name, durations, **extra):
+    return {
+        "name": name,
+        "unit": "s",
+        "repeat": len(durations),
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.fmean(durations),
+        "max": max(durations),
+        **extra,
+    }
+
+
+def synthetic_payload(hours):
+    hourly = synthetic_hourly(hours)
+    hourly["time"] = list(range(SYNTHETIC_START, SYNTHETIC_START + hours * 3600, 3600))
+    return {"utc_offset_seconds": 0, "hourly": hourly}
+
+
+def hourly_payloads(fixtures):
+    """{label: payload} of recorded responses with an hourly block."""
+    payloads = {
+        fixture["path"].strip("/").replace("/", "_")
+        + f"_{len(fixture['body']['hourly']['time'])}h": fixture["body"]
+        for fixture in fixtures
+        if isinstance(fixture["body"], dict)
+        and "time" in fixture["body"].get("hourly", {})
+    }
+    return payloads or {"synthetic_7d": synthetic_payload(7 * 24)}
+
+
+# ─── In-Process Benchmarks ────────────────────────────────────────
+def bench_mesh_load():
+    results = []
+    for directory in ASSET_DIRS:
+        for obj_path in sorted(glob.glob(os.path.join(ROOT, directory, "*.obj"))):
+            asset = f"{directory}/{os.path.basename(obj_path)}"
+
+            def cold():
+                clear_cache()
+                get_mesh(obj_path)
+
+            triangles = len(get_mesh(obj_path).indices) // 3
+            for stage, function in (
+                ("obj_parse", lambda: parse_obj(obj_path)),
+                ("cold", cold),
+                ("cached", lambda: get_mesh(obj_path)),
+            ):
+                results.append(
+                    result(
+                        f"mesh_load.{stage}[{asset}]",
+                        measure(function),
+                        triangles=triangles,
+                    )
+                )
+    clear_cache()
+    return results
+
+
+def bench_parse(payloads):
+    results = []
+    for label, payload in payloads.items():
+        raw = json.dumps(payload).encode()
+        results.append(
+            result(
+                f"parse[{label}]",
+                measure(lambda: decode_columns(loads(raw)["hourly"])),
+                bytes=len(raw),
+            )
+        )
+    return results
+
+
+def bench_aggregation(payloads):
+    results = []
+    for label, payload in payloads.items():
+        columns = decode_columns(payload["hourly"])
+        if not all(name in columns for name in STATISTICS):
+            continue
+        results.append(
+            result(
+                f"aggregate_daily[{label}]",
+                measure(
+                    lambda: aggregate_daily(
+                        columns["time"],
+                        columns,
+                        STATISTICS,
+                        utc_offset_seconds=payload.get("utc_offset_seconds", 0),
+                    )
+                ),
+                hours=len(columns["time"]),
+            )
+        )
+    return results
+
+
+# ─── Dashboard Benchmarks ─────────────────────────────────────────
+def read_events(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.endswith("\n")]
+
+
+def tick_latencies(events):
+    """Fetch start to last widget update, per completed real-time tick."""
+    latencies, fetch, applies = [], None, 0
+    for event in sorted(events, key=lambda e: e["end"]):
+        if event["name"] == "realtime_fetch":
+            fetch, applies = event, 0
+        elif event["name"] == "realtime_apply" and fetch is not None:
+            applies += 1
+            if applies == APPLIES_PER_TICK:
+                latencies.append(event["end"] - (fetch["end"] - fetch["seconds"]))
+                fetch = None
+    return latencies
+
+
+def run_script(script, fixture_dir, ticks):
+    """Start `script` offline; returns (events, started, error or None)."""
+    workdir = tempfile.mkdtemp(prefix="weather-bench-")
+    for directory in ASSET_DIRS:
+        shutil.copytree(os.path.join(ROOT, directory), os.path.join(workdir, directory))
+    if os.path.exists(os.path.join(ROOT, "locations.json")):
+        shutil.copy(os.path.join(ROOT, "locations.json"), workdir)
+    server = FixtureServer(fixture_dir, shift_time=True).start()
+    log_path = os.path.join(workdir, "events.jsonl")
+    env = dict(
+        os.environ,
+        OPEN_METEO_BASE_URL=server.base_url,
+        WEATHER_BENCH_LOG=log_path,
+        WEATHER_PLAYBACK_SPEED="max",
+        WEATHER_REALTIME_INTERVAL=str(TICK_INTERVAL),
+    )
+    env.pop("WEATHER_RECORD_DIR", None)
+    error = None
+    try:
+        with open(os.path.join(workdir, "stderr.txt"), "w+") as stderr:
+            started = time.time()
+            process = subprocess.Popen(
+                [sys.executable, os.path.join(SCRIPT_DIR, script)],
+                cwd=workdir,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr,
+            )
+            while True:
+                events = read_events(log_path)
+                painted = any(e["name"] == "first_paint" for e in events)
+                if painted and len(tick_latencies(events)) >= ticks:
+                    break
+                if process.poll() is not None:
+                    stderr.seek(0)
+                    lines = stderr.read().strip().splitlines() or ["no output"]
+                    error = f"exited with {process.returncode}: {lines[-1]}"
+                    break
+                if time.time() - started > SCRIPT_TIMEOUT:
+                    error = f"timed out after {SCRIPT_TIMEOUT:.0f} s"
+                    break
+                time.sleep(0.1)
+            process.terminate()
+            process.wait()
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return events, started, error
+
+
+def bench_dashboards(fixture_dir):
+    results, skipped = [], []
+    if importlib.util.find_spec("lightningchart") is None:
+        reason = "lightningchart is not installed"
+    elif not fixture_dir or not glob.glob(os.path.join(fixture_dir, "*.json")):
+        reason = "no recorded fixtures"
+    else:
+        reason = None
+    for script, runs_ticks in SCRIPTS.items():
+        if reason:
+            skipped.append({"name": script, "reason": reason})
+            continue
+        events, started, error = run_script(
+            script, fixture_dir, TICKS if runs_ticks else 0
+        )
+        paints = [e["end"] for e in events if e["name"] == "first_paint"]
+        if paints:
+            results.append(result(f"cold_start[{script}]", [paints[0] - started]))
+        for name in ("update_next_6_hours", "realtime_fetch", "realtime_apply"):
+            durations = [e["seconds"] for e in events if e["name"] == name]
+            if durations:
+                results.append(result(f"{name}[{script}]", durations))
+        if tick_latencies(events):
+            results.append(result(f"realtime_tick[{script}]", tick_latencies(events)))
+        if error:
+            skipped.append({"name": script, "reason": error})
+    return results, skipped
+
+
+# ─── Results File ─────────────────────────────────────────────────
+def git_commit():
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True
+            ).stdout.strip()
+            or None
+        )
+    except OSError:
+        return None
+
+
+def compare(results, baseline_path, threshold=REGRESSION_THRESHOLD):
+    """Print median changes against a previous results file; returns regressions."""
+    with open(baseline_path) as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        old = baseline.get(r["name"])
+        if old is None or not old["median"]:
+            continue
+        ratio = r["median"] / old["median"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(r["name"])
+            flag = "  REGRESSION"
+        print(f"{r['name']:<60} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def run(fixture_dir=None, dashboards=True):
+    fixtures = list(load_fixtures(fixture_dir)[0].values()) if fixture_dir else []
+    payloads = hourly_payloads(fixtures)
+    results = bench_mesh_load() + bench_parse(payloads) + bench_aggregation(payloads)
+    skipped = []
+    if dashboards:
+        dashboard_results, skipped = bench_dashboards(fixture_dir)
+        results += dashboard_results
+    for r in results:
+        print(f"{r['name']:<60} median {r['median'] * 1000:9.2f} ms (n={r['repeat']})")
+    for s in skipped:
+        print(f"{s['name']:<60} skipped: {s['reason']}")
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fixtures": fixture_dir,
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the dashboard benchmarks")
+    parser.add_argument("--fixtures", help="directory of recorded responses")
+    parser.add_argument(
+        "--output",
+        default=os.path.join(
+            "benchmarks", "results", f"{datetime.now():%Y%m%d-%H%M%S}.json"
+        ),
+    )
+    parser.add_argument("--compare", help="previous results file")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--no-dashboards", action="store_true")
+    args = parser.parse_args()
+
+    report = run(args.fixtures, dashboards=not args.no_dashboards)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.compare and compare(report["results"], args.compare, args.threshold):
+        sys.exit(1)
@@ -0,0 +1,129 @@
+import calendar
+import json
+import os
+import sys
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python FIles")
+)
+import backfill  # noqa: E402
+import weather_client  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+from weather_store import WeatherStore, location_key  # noqa: E402
+
+# ─── Offline Backfill Test ────────────────────────────────────────
+# Archive responses are recorded once (WEATHER_RECORD_DIR mechanism) from a
+# local stand-in for the archive API, then the backfill runs against the
+# fixture server replaying them: chunking, checkpoint resume and idempotent
+# upserts are checked without network access.
+#     python -m pytest tests
+
+START, END = date(2024, 1, 1), date(2024, 3, 31)
+CHUNK_DAYS = 30
+LATITUDE, LONGITUDE = 60.1699, 24.9384
+VARIABLES = ["temperature_2m", "weather_code"]
+
+
+class _ArchiveHandler(BaseHTTPRequestHandler):
+    """Hourly values for start_date..end_date, like /v1/archive."""
+
+    def do_GET(self):
+        params = dict(parse_qsl(urlparse(self.path).query))
+        first = calendar.timegm(date.fromisoformat(params["start_date"]).timetuple())
+        days = (
+            date.fromisoformat(params["end_date"])
+            - date.fromisoformat(params["start_date"])
+        ).days + 1
+        times = list(range(first, first + days * 86400, 3600))
+        hourly = {"time": times}
+        for variable in params["hourly"].split(","):
+            hourly[variable] = [(t // 3600) % 100 for t in times]
+        data = json.dumps({"utc_offset_seconds": 0, "hourly": hourly}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _run(url, store, checkpoint_dir):
+    return backfill.backfill(
+        START,
+        END,
+        latitude=LATITUDE,
+        longitude=LONGITUDE,
+        url=url,
+        store=store,
+        chunk_days=CHUNK_DAYS,
+        workers=2,
+        checkpoint_dir=str(checkpoint_dir),
+    )
+
+
+@pytest.fixture
+def recordings(tmp_path, monkeypatch):
+    archive = ThreadingHTTPServer(("127.0.0.1", 0), _ArchiveHandler)
+    threading.Thread(target=archive.serve_forever, daemon=True).start()
+    monkeypatch.setattr(weather_client, "RECORD_DIR", str(tmp_path / "fixtures"))
+    try:
+        _run(
+            f"http://127.0.0.1:{archive.server_address[1]}/v1/archive",
+            WeatherStore(str(tmp_path / "recording.sqlite")),
+            tmp_path / "recording",
+        )
+    finally:
+        archive.shutdown()
+        archive.server_close()
+    monkeypatch.setattr(weather_client, "RECORD_DIR", None)
+    return tmp_path / "fixtures"
+
+
+def test_date_chunks_cover_range_without_overlap():
+    chunks = backfill.date_chunks(START, END, CHUNK_DAYS)
+    assert chunks[0][0] == START and chunks[-1][1] == END
+    for (_, previous_end), (next_start, _) in zip(chunks, chunks[1:]):
+        assert next_start == previous_end + timedelta(days=1)
+    assert len(chunks) == 4
+
+
+def test_backfill_replays_recordings_and_resumes(recordings, tmp_path):
+    server = FixtureServer(str(recordings)).start()
+    url = server.base_url + "/v1/archive"
+    store = WeatherStore(str(tmp_path / "store.sqlite"))
+    location = location_key(LATITUDE, LONGITUDE)
+    first = calendar.timegm(START.timetuple())
+    end = calendar.timegm((END + timedelta(days=1)).timetuple())
+    try:
+        assert _run(url, store, tmp_path) == 4
+        assert (server.served, server.missing) == (4, 0)
+        stored = store.read(location, VARIABLES, first, end)
+        assert len(stored["time"]) == (END - START).days * 24 + 24
+
+        # Everything is checkpointed: a second run fetches nothing
+        assert _run(url, store, tmp_path) == 0
+        assert server.served == 4
+
+        # Losing one chunk from the checkpoint refetches only that chunk, and
+        # the upsert leaves the stored rows unchanged
+        path = backfill.checkpoint_path(location, str(tmp_path))
+        done = backfill.load_checkpoint(path)
+        done.remove(backfill.chunk_id(*backfill.date_chunks(START, END, CHUNK_DAYS)[1]))
+        backfill.save_checkpoint(path, done)
+        assert _run(url, store, tmp_path) == 1
+        assert server.served == 5
+        again = store.read(location, VARIABLES, first, end)
+        assert len(again["time"]) == len(stored["time"])
+        for variable in ["time", *VARIABLES]:
+            assert (again[variable] == stored[variable]).all()
+    finally:
+        server.shutdown()
+        server.server_close()